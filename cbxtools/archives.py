@@ -9,9 +9,9 @@ from .core.image_analyzer import ImageAnalyzer
 
 
 # Re-export main functions for backward compatibility
-def extract_archive(archive_path, extract_dir, logger):
+def extract_archive(archive_path, extract_dir, logger, members=None):
     """Extract CBZ/CBR/CB7 archive to temporary directory."""
-    return ArchiveHandler.extract_archive(archive_path, extract_dir, logger)
+    return ArchiveHandler.extract_archive(archive_path, extract_dir, logger, members)
 
 
 def create_cbz(source_dir, output_file, logger, compresslevel=9):
@@ -19,9 +19,10 @@ def create_cbz(source_dir, output_file, logger, compresslevel=9):
     return ArchiveHandler.create_cbz(source_dir, output_file, logger, compresslevel)
 
 
-def create_archive(source_dir, output_file, format_type, logger, compresslevel=9):
+def create_archive(source_dir, output_file, format_type, logger, compresslevel=9, sevenzip_method='lzma2'):
     """Create a new archive file from the contents of source_dir in specified format."""
-    return ArchiveHandler.create_archive(source_dir, output_file, format_type, logger, compresslevel)
+    return ArchiveHandler.create_archive(source_dir, output_file, format_type, logger, compresslevel,
+                                         sevenzip_method)
 
 
 def find_comic_archives(directory, recursive=False):
@@ -10,6 +10,7 @@ import argparse
 import subprocess
 import shutil
 import os
+import multiprocessing
 from pathlib import Path
 
 from .utils import setup_logging, log_effective_parameters
@@ -17,7 +18,8 @@ from .core.path_validator import PathValidator
 from .core.filesystem_utils import FileSystemUtils
 from .core.file_processor import FileProcessor, find_processable_items
 from .archives import find_comic_archives
-from .conversion import process_single_file, process_archive_files
+from .conversion import (process_single_file, process_archive_files,
+                         make_conversion_pool, conversion_options_from_args)
 from .stats_tracker import StatsTracker, print_summary_report, print_lifetime_stats
 from .watchers import watch_directory, cleanup_empty_directories
 from .presets import (list_available_presets, apply_preset_with_overrides, 
@@ -71,6 +73,18 @@ def check_and_install_dependencies(logger, auto_install=False):
                 'description': 'Optional for debug histogram visualizations',
                 'available': False
             },
+            'cv2': {
+                'import_name': 'cv2',
+                'package_name': 'opencv-python-headless',
+                'description': 'Optional for faster unsharp_mask/reduce_noise preprocessing',
+                'available': False
+            },
+            'psutil': {
+                'import_name': 'psutil',
+                'package_name': 'psutil',
+                'description': 'Optional for sizing the conversion pool by available memory on non-Linux systems',
+                'available': False
+            },
             'patoolib': {
                 'import_name': 'patoolib',
                 'package_name': 'patool',
@@ -106,6 +120,9 @@ def check_and_install_dependencies(logger, auto_install=False):
         else:
             logger.info(f"○ {name} is missing - {info['description']}")
             missing_optional.append(info)
+
+    if dependencies['required']['PIL']['available']:
+        report_pillow_build(logger)
     
     # Handle missing dependencies
     if missing_required or missing_optional:
@@ -130,6 +147,30 @@ def check_and_install_dependencies(logger, auto_install=False):
     }
 
 
+def report_pillow_build(logger):
+    """
+    Log whether the installed Pillow has the fast decode/resize paths.
+
+    JPEG decoding (including draft-mode DCT scaling) is much faster with
+    libjpeg-turbo, and Pillow-SIMD vectorises the Lanczos resize and filters.
+    """
+    import PIL
+    from PIL import features
+
+    try:
+        turbo = features.check_feature('libjpeg_turbo')
+    except ValueError:  # Pillow too old to report it
+        turbo = None
+    # Pillow-SIMD releases carry a .postN suffix on the upstream version
+    simd = '.post' in PIL.__version__
+
+    logger.debug(f"Pillow {PIL.__version__}: libjpeg-turbo={turbo}, SIMD build={simd}")
+    if turbo is False:
+        logger.info("○ Pillow is not built with libjpeg-turbo - JPEG decoding will be slower")
+    if not simd:
+        logger.debug("○ Pillow-SIMD not detected - see README (Installation) for a faster resize build")
+
+
 def offer_to_install_dependencies(missing_deps, logger):
     """
     Offer to install missing dependencies interactively.
@@ -287,6 +328,12 @@ def parse_arguments():
     compression_group = parser.add_argument_group('Advanced Compression Options')
     compression_group.add_argument('--method', type=int, choices=range(0, 7), default=None,
                         help='WebP compression method (0-6): higher = better compression but slower')
+    compression_group.add_argument('--webp-method-large', type=int, choices=range(0, 7), default=None,
+                        help='WebP method for images over 2 megapixels (default: --method, capped at 4)')
+    compression_group.add_argument('--webp-method-small', type=int, choices=range(0, 7), default=None,
+                        help='WebP method for images up to 2 megapixels (default: --method)')
+    compression_group.add_argument('--resize-filter', choices=['lanczos', 'bicubic', 'bilinear'], default=None,
+                        help='Resampling filter for downscaling (default: lanczos; bicubic is about twice as fast)')
     compression_group.add_argument('--preprocessing', choices=['none', 'unsharp_mask', 'reduce_noise'], default=None,
                         help='Apply preprocessing to images before compression')
     compression_group.add_argument('--zip-compression', type=int, choices=range(0, 10), default=None,
@@ -295,6 +342,10 @@ def parse_arguments():
                         help='Use lossless WebP compression (larger but perfect quality)')
     compression_group.add_argument('--no-lossless', action='store_true',
                         help='Disable lossless compression even if preset enables it')
+    compression_group.add_argument('--fast-resize', action='store_true', default=None,
+                        help='Bilinear pre-shrink before the Lanczos pass on large (>2x) downscales')
+    compression_group.add_argument('--no-fast-resize', action='store_true',
+                        help='Disable fast resize even if preset enables it')
     
     # Image transformation options
     transform_group = parser.add_argument_group('Image Transformation Options')
@@ -335,6 +386,10 @@ def parse_arguments():
     output_group = parser.add_argument_group('Output Options')
     output_group.add_argument('--output', choices=['zip', 'cbz', '7z', 'cb7'], 
                             default='cbz', help='Output archive format (default: cbz)')
+    output_group.add_argument('--7z-method', dest='sevenzip_method', choices=['lzma2', 'zstd'],
+                            default='lzma2',
+                            help='Compressor for 7z/cb7 output (default: lzma2). zstd is much faster '
+                                 'to write but needs a 7-Zip build with Zstandard support to open')
     output_group.add_argument('--no-cbz', action='store_true',
                             help='Do not create an archive file with the WebP images')
     output_group.add_argument('--keep-originals', action='store_true',
@@ -343,6 +398,9 @@ def parse_arguments():
                             help='Recursively search for CBZ/CBR files in subdirectories')
     output_group.add_argument('--threads', type=int, default=0,
                             help='Number of parallel threads to use (0 = auto-detect)')
+    output_group.add_argument('--thread-pool', action='store_true',
+                            help='Convert images on threads in one process instead of worker '
+                                 'processes (no process startup or task pickling)')
     
     # Logging/stats options
     logging_group = parser.add_argument_group('Logging and Statistics')
@@ -432,6 +490,8 @@ def parse_arguments():
     # Handle negation flags
     if args.no_lossless:
         args.lossless = False
+    if args.no_fast_resize:
+        args.fast_resize = False
     if args.no_grayscale:
         args.grayscale = False
     if args.no_auto_contrast:
@@ -733,7 +793,13 @@ def process_single_archive_file(input_path, output_dir, args, logger):
         auto_greyscale_percent_threshold=args.auto_greyscale_percent_threshold,
         preserve_auto_greyscale_png=args.preserve_auto_greyscale_png,
         output_format=args.output,
-        verbose=args.verbose
+        sevenzip_method=args.sevenzip_method,
+        verbose=args.verbose,
+        fast_resize=args.fast_resize,
+        webp_method_large=args.webp_method_large,
+        webp_method_small=args.webp_method_small,
+        use_threads=args.thread_pool,
+        resize_filter=args.resize_filter
     )
 
     if success and not args.no_cbz:
@@ -783,55 +849,66 @@ def process_directory_recursive(input_path, output_dir, args, logger):
     # Store list of archives to process
     archives_to_process = list(archives)
     
-    for archive in archives_to_process:
-        # Calculate relative path to maintain directory structure
-        rel_path = archive.parent.relative_to(input_path)
-        target_output_dir = output_dir / rel_path
-        target_output_dir.mkdir(parents=True, exist_ok=True)
+    # One conversion pool for every archive in the tree rather than one per archive
+    conversion_threads = args.threads if args.threads > 0 else multiprocessing.cpu_count()
+    options = conversion_options_from_args(args)
+    with make_conversion_pool(conversion_threads, options, args.thread_pool) as executor:
+        for archive in archives_to_process:
+            # Calculate relative path to maintain directory structure
+            rel_path = archive.parent.relative_to(input_path)
+            target_output_dir = output_dir / rel_path
+            target_output_dir.mkdir(parents=True, exist_ok=True)
         
-        logger.info(f"Processing: {archive}")
-        logger.debug(f"Output directory: {target_output_dir}")
+            logger.info(f"Processing: {archive}")
+            logger.debug(f"Output directory: {target_output_dir}")
         
-        success, orig_size, new_size = process_single_file(
-            input_file=archive, 
-            output_dir=target_output_dir,
-            quality=args.quality,
-            max_width=args.max_width,
-            max_height=args.max_height,
-            no_cbz=args.no_cbz,
-            keep_originals=args.keep_originals,
-            num_threads=args.threads,
-            logger=logger,
-            method=args.method,
-            preprocessing=args.preprocessing,
-            zip_compresslevel=args.zip_compression,
-            lossless=args.lossless,
-            grayscale=args.grayscale,
-            auto_contrast=args.auto_contrast,
-            auto_greyscale=args.auto_greyscale,
-            auto_greyscale_pixel_threshold=args.auto_greyscale_pixel_threshold,
-        auto_greyscale_percent_threshold=args.auto_greyscale_percent_threshold,
-        preserve_auto_greyscale_png=args.preserve_auto_greyscale_png,
-        output_format=args.output,
-        verbose=args.verbose
-    )
+            success, orig_size, new_size = process_single_file(
+                input_file=archive, 
+                output_dir=target_output_dir,
+                quality=args.quality,
+                max_width=args.max_width,
+                max_height=args.max_height,
+                no_cbz=args.no_cbz,
+                keep_originals=args.keep_originals,
+                num_threads=conversion_threads,
+                logger=logger,
+                method=args.method,
+                preprocessing=args.preprocessing,
+                zip_compresslevel=args.zip_compression,
+                lossless=args.lossless,
+                grayscale=args.grayscale,
+                auto_contrast=args.auto_contrast,
+                auto_greyscale=args.auto_greyscale,
+                auto_greyscale_pixel_threshold=args.auto_greyscale_pixel_threshold,
+                auto_greyscale_percent_threshold=args.auto_greyscale_percent_threshold,
+                preserve_auto_greyscale_png=args.preserve_auto_greyscale_png,
+                output_format=args.output,
+                sevenzip_method=args.sevenzip_method,
+                verbose=args.verbose,
+                fast_resize=args.fast_resize,
+                webp_method_large=args.webp_method_large,
+                webp_method_small=args.webp_method_small,
+                executor=executor,
+                use_threads=args.thread_pool,
+                resize_filter=args.resize_filter
+            )
         
-        if success:
-            success_count += 1
-            total_original_size += orig_size
-            total_new_size += new_size
-            processed_files.append((str(rel_path / archive.name), orig_size, new_size))
+            if success:
+                success_count += 1
+                total_original_size += orig_size
+                total_new_size += new_size
+                processed_files.append((str(rel_path / archive.name), orig_size, new_size))
             
-            # Delete original and clean up empty directories if requested
-            if args.delete_originals:
-                try:
-                    archive.unlink()
-                    logger.info(f"Deleted original file: {archive}")
+                # Delete original and clean up empty directories if requested
+                if args.delete_originals:
+                    try:
+                        archive.unlink()
+                        logger.info(f"Deleted original file: {archive}")
                     
-                    # Check if parent directory is now empty and remove if it is
-                    FileSystemUtils.remove_empty_dirs(archive.parent, input_path, logger)
-                except Exception as e:
-                    logger.error(f"Error deleting file {archive}: {e}")
+                        # Check if parent directory is now empty and remove if it is
+                        FileSystemUtils.remove_empty_dirs(archive.parent, input_path, logger)
+                    except Exception as e:
+                        logger.error(f"Error deleting file {archive}: {e}")
     
     return success_count, len(archives), total_original_size, total_new_size, processed_files
 
@@ -891,7 +968,8 @@ def main():
         'zip_compression', 'lossless',
         'grayscale', 'auto_contrast',
         'auto_greyscale', 'auto_greyscale_pixel_threshold', 'auto_greyscale_percent_threshold',
-        'preserve_auto_greyscale_png'
+        'preserve_auto_greyscale_png', 'fast_resize',
+        'webp_method_large', 'webp_method_small', 'resize_filter'
     ]:
         value = getattr(args, param)
         # Only override if the user explicitly set it 
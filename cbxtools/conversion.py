@@ -6,20 +6,26 @@ Now uses consolidated utilities.
 
 import os
 import shutil
+import logging
 import tempfile
 import multiprocessing
 from pathlib import Path
-from PIL import Image
+from PIL import Image, ImageFilter, ImageOps, UnidentifiedImageError
 import numpy as np
 import queue
 import threading
 import time
-from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass
+from functools import lru_cache
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait
+from typing import Optional
 
 from .core.image_analyzer import ImageAnalyzer
 from .core.filesystem_utils import FileSystemUtils
 from .core.packaging_worker import AsynchronousPackagingWorker
-from .archives import extract_archive, create_cbz
+from .core.archive_handler import ArchiveHandler
+from .archives import extract_archive, create_cbz, create_archive
 
 
 # Re-export image analysis functions for backward compatibility
@@ -38,34 +44,492 @@ def convert_to_bw_with_contrast(img):
     return ImageAnalyzer.convert_to_bw_with_contrast(img)
 
 
+# Extensions (lowercase, no leading dot) of images that get re-encoded to WebP.
+# Existing WebP files are copied through untouched like any other non-image file.
+_CONVERTIBLE_EXTS = frozenset(
+    ext[1:] for ext in ImageAnalyzer.IMAGE_EXTENSIONS if ext != '.webp'
+)
+
+# Pillow formats to try first when opening a page (covers ImageAnalyzer.IMAGE_EXTENSIONS),
+# so Image.open() usually probes only these plugins instead of every registered one
+_OPEN_FORMATS = ('JPEG', 'PNG', 'GIF', 'BMP', 'TIFF', 'WEBP', 'TGA', 'ICO')
+
+
+def _open_page(path):
+    """Image.open() trying _OPEN_FORMATS first, then every plugin Pillow has.
+
+    A page whose contents don't match its extension (a PPM saved as .png, say)
+    still opens, as it did before the whitelist.
+    """
+    try:
+        return Image.open(path, formats=_OPEN_FORMATS)
+    except UnidentifiedImageError:
+        return Image.open(path)
+
+
+def _iter_files(root):
+    """Yield ``(path, relpath)`` strings for every file below root.
+
+    Uses os.scandir so file/dir type comes from the cached directory entry
+    instead of an extra stat() per file.
+    """
+    root = os.fspath(root)
+    prefix_len = len(root) + 1
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file():
+                    yield entry.path, entry.path[prefix_len:]
+
+
+# convert_to_webp logs an INFO progress line every this many images
+PROGRESS_LOG_INTERVAL = 25
+
+
+# Below these limits a directory is converted inline: process-pool startup and
+# pickling the work over IPC would cost more than the conversions themselves.
+INLINE_CONVERSION_MAX_IMAGES = 2
+INLINE_CONVERSION_MAX_BYTES = 4 * 1024 * 1024
+
+
+def _should_convert_inline(conversion_args, num_threads):
+    """Return True if the images are too few or too small to be worth a process pool."""
+    if num_threads == 1 or len(conversion_args) <= INLINE_CONVERSION_MAX_IMAGES:
+        return True
+    total_bytes = 0
+    for task in conversion_args:
+        try:
+            total_bytes += task[0].stat().st_size
+        except OSError:
+            return False
+        if total_bytes >= INLINE_CONVERSION_MAX_BYTES:
+            return False
+    return True
+
+
+# Conversion options installed once per worker process by the pool initializer,
+# so that tasks only need to carry (img_path, webp_path).
+_WORKER_OPTIONS = None
+
+
+def _init_worker(options):
+    """ProcessPoolExecutor initializer: stash the shared conversion options.
+
+    Also registers every Pillow plugin up front. Image.open(formats=...) names
+    plugins outside Pillow's preinit() set (WEBP, TIFF, ...), which would
+    otherwise trigger the full Image.init() scan inside a worker's first task
+    (spawn-start platforms don't inherit the parent's registry).
+    """
+    global _WORKER_OPTIONS
+    _WORKER_OPTIONS = options
+    Image.init()
+
+
+class ConversionPool(ProcessPoolExecutor):
+    """Process pool whose workers are pre-loaded with one set of conversion options.
+
+    convert_to_webp() recognises a pool built with matching options and submits
+    bare path pairs to it instead of pickling the options with every image.
+    """
+
+    def __init__(self, max_workers, options):
+        super().__init__(max_workers=max_workers, initializer=_init_worker, initargs=(options,))
+        self.options = options
+        self.max_workers = max_workers
+
+
+class ThreadConversionPool(ThreadPoolExecutor):
+    """Thread pool for converting in-process (--thread-pool).
+
+    Pillow's decode/resize/encode and the NumPy analysis release the GIL, so
+    threads convert in parallel without process startup or pickling every task
+    and result. Tasks carry their own options (``options`` is None), since the
+    threads share one interpreter with whatever else is converting.
+    """
+
+    options = None
+
+    def __init__(self, max_workers):
+        super().__init__(max_workers=max_workers, thread_name_prefix='cbxtools-convert')
+        self.max_workers = max_workers
+
+
+def make_conversion_pool(max_workers, options, use_threads=False):
+    """Return a ThreadConversionPool if ``use_threads``, else a ConversionPool."""
+    if use_threads:
+        return ThreadConversionPool(max_workers)
+    return ConversionPool(max_workers, options)
+
+
+def _run_chunk(fn, chunk):
+    return [fn(args) for args in chunk]
+
+
+def imap_unordered(executor, fn, iterable, chunksize=1, max_in_flight=None):
+    """multiprocessing.Pool.imap_unordered() for a concurrent.futures executor.
+
+    Work is shipped in chunks of ``chunksize`` items and results are yielded
+    as soon as any chunk finishes, so one slow page never holds up the rest.
+    At most ``max_in_flight`` chunks are submitted at a time (default: twice
+    the executor's max_workers, if it has one); the next chunk goes in as
+    each one completes, so pending tasks stay O(workers) rather than O(pages).
+    """
+    if max_in_flight is None:
+        max_in_flight = 2 * getattr(executor, 'max_workers', 0) or None
+    items = list(iterable)
+    chunks = (items[start:start + chunksize] for start in range(0, len(items), chunksize))
+    pending = set()
+    for chunk in chunks:
+        pending.add(executor.submit(_run_chunk, fn, chunk))
+        if max_in_flight is not None and len(pending) >= max_in_flight:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from future.result()
+    for future in as_completed(pending):
+        yield from future.result()
+
+
+def _available_memory():
+    """Return the bytes of RAM available for new allocations, or None if unknown."""
+    try:
+        import psutil
+        return psutil.virtual_memory().available
+    except ImportError:
+        pass
+    try:
+        with open('/proc/meminfo') as meminfo:
+            for line in meminfo:
+                if line.startswith('MemAvailable:'):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def memory_capped_workers(num_threads, sample_image):
+    """Limit num_threads so every worker's decoded image fits in available RAM.
+
+    The decoded size of ``sample_image`` (read from its header, no decode) is
+    budgeted twice per worker to cover the copies made while converting.
+    Returns num_threads unchanged if memory or the sample can't be measured.
+    """
+    available = _available_memory()
+    if available is None:
+        return num_threads
+    try:
+        with _open_page(sample_image) as img:
+            sample_bytes = img.width * img.height * len(img.getbands())
+    except Exception:
+        return num_threads
+    if sample_bytes <= 0:
+        return num_threads
+    return min(num_threads, max(1, available // (sample_bytes * 2)))
+
+
+class ConversionGate:
+    """Lets directories convert side by side, except memory-capped ones.
+
+    Ordinary conversions hold the gate shared. A conversion that
+    memory_capped_workers() narrowed holds it alone: it waits for the others
+    to finish and keeps new ones out until it is done, so its smaller pool
+    never decodes beside the shared one.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._shared = 0
+        self._exclusive = False
+        self._exclusive_waiting = 0
+
+    @contextmanager
+    def hold(self, exclusive=False):
+        with self._cond:
+            if exclusive:
+                self._exclusive_waiting += 1
+                self._cond.wait_for(lambda: not self._exclusive and self._shared == 0)
+                self._exclusive_waiting -= 1
+                self._exclusive = True
+            else:
+                # Waiting exclusive holders go first, so they can't be starved
+                self._cond.wait_for(lambda: not self._exclusive and not self._exclusive_waiting)
+                self._shared += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                if exclusive:
+                    self._exclusive = False
+                else:
+                    self._shared -= 1
+                self._cond.notify_all()
+
+
+@dataclass(frozen=True)
+class ConvertOptions:
+    """Per-batch conversion settings consumed by convert_single_image().
+
+    Built once per directory (or once per ConversionPool) and shared by every
+    page; attribute reads replace a dict lookup per option per page, and a
+    frozen instance compares and pickles as a plain value.
+    """
+    quality: int = 80
+    max_width: int = 0
+    max_height: int = 0
+    method: int = 4
+    preprocessing: Optional[str] = None
+    lossless: bool = False
+    grayscale: bool = False
+    auto_contrast: bool = False
+    auto_greyscale: bool = False
+    auto_greyscale_pixel_threshold: int = 16
+    auto_greyscale_percent_threshold: float = 0.01
+    preserve_auto_greyscale_png: bool = False
+    verbose: bool = False
+    fast_resize: bool = False
+    webp_method_large: Optional[int] = None
+    webp_method_small: Optional[int] = None
+    resize_filter: str = 'lanczos'
+
+
+_DEFAULT_OPTIONS = ConvertOptions()
+
+
+def _as_convert_options(options):
+    """Accept a ConvertOptions, a (partial) dict of the same fields, or None."""
+    if isinstance(options, ConvertOptions):
+        return options
+    if not options:
+        return _DEFAULT_OPTIONS
+    return ConvertOptions(**options)
+
+
+def build_conversion_options(
+    quality=80,
+    max_width=0,
+    max_height=0,
+    method=4,
+    preprocessing=None,
+    lossless=False,
+    grayscale=False,
+    auto_contrast=False,
+    auto_greyscale=False,
+    auto_greyscale_pixel_threshold=16,
+    auto_greyscale_percent_threshold=0.01,
+    preserve_auto_greyscale_png=False,
+    verbose=False,
+    fast_resize=False,
+    webp_method_large=None,
+    webp_method_small=None,
+    resize_filter='lanczos',
+):
+    """Build the ConvertOptions consumed by convert_single_image()."""
+    return ConvertOptions(
+        quality=quality,
+        max_width=max_width,
+        max_height=max_height,
+        method=method,
+        preprocessing=preprocessing,
+        lossless=lossless,
+        grayscale=grayscale,
+        auto_contrast=auto_contrast,
+        auto_greyscale=auto_greyscale,
+        auto_greyscale_pixel_threshold=auto_greyscale_pixel_threshold,
+        auto_greyscale_percent_threshold=auto_greyscale_percent_threshold,
+        preserve_auto_greyscale_png=preserve_auto_greyscale_png,
+        verbose=verbose,
+        fast_resize=fast_resize,
+        webp_method_large=webp_method_large,
+        webp_method_small=webp_method_small,
+        resize_filter=resize_filter,
+    )
+
+
+# Images above this many pixels (after resizing) are encoded with
+# webp_method_large; page-sized scans are where methods 5/6 hurt most
+LARGE_IMAGE_PIXELS = 2_000_000
+
+
+def select_webp_method(width, height, method, webp_method_large=None, webp_method_small=None):
+    """Pick the WebP encoder method for an image of the given size.
+
+    Large images use webp_method_large, defaulting to at most 4: methods 5/6
+    cost several times the encode time for a ~2-3% smaller file. Smaller
+    images use webp_method_small, defaulting to ``method``.
+    """
+    if width * height > LARGE_IMAGE_PIXELS:
+        return min(method, 4) if webp_method_large is None else webp_method_large
+    return method if webp_method_small is None else webp_method_small
+
+
+# Pillow's reducing_gap for the final resize: integer box reduction first,
+# Lanczos only over the last <= 3x of the downscale (visually indistinguishable)
+RESIZE_REDUCING_GAP = 3.0
+
+# --resize-filter choices for the final resize pass. Lanczos (the default) is
+# the sharpest; bicubic has half the taps, bilinear fewer still
+RESIZE_FILTERS = {
+    'lanczos': Image.Resampling.LANCZOS,
+    'bicubic': Image.Resampling.BICUBIC,
+    'bilinear': Image.Resampling.BILINEAR,
+}
+
+
+def _fit_scale(width, height, max_width, max_height):
+    """Return the downscale factor (<= 1.0) that fits width x height within the limits."""
+    scale_factor = 1.0
+    if max_width > 0 and width > max_width:
+        scale_factor = min(scale_factor, max_width / width)
+    if max_height > 0 and height > max_height:
+        scale_factor = min(scale_factor, max_height / height)
+    return scale_factor
+
+
+@lru_cache(maxsize=None)
+def _load_cv2():
+    """Import OpenCV on first use (it is optional and slow to import); None if unavailable."""
+    try:
+        import cv2
+    except ImportError:
+        return None
+    return cv2
+
+
+def _reduce_noise_kernel():
+    """Fold 'reduce_noise' (90/10 blend with a sigma 0.5 Gaussian, then SHARPEN) into one kernel.
+
+    Both steps are linear, so convolving their 3x3 kernels gives a single 5x5
+    kernel that produces the same image in one pass instead of three.
+    """
+    sharpen = np.array([[-2, -2, -2],
+                        [-2, 32, -2],
+                        [-2, -2, -2]], dtype=np.float64) / 16  # ImageFilter.SHARPEN
+    g = np.exp(-np.arange(-1, 2) ** 2 / (2 * 0.5 ** 2))
+    g /= g.sum()
+    blend = 0.1 * np.outer(g, g)
+    blend[1, 1] += 0.9
+    kernel = np.zeros((5, 5))
+    for y in range(3):
+        for x in range(3):
+            kernel[y:y + 3, x:x + 3] += sharpen[y, x] * blend
+    return kernel.astype(np.float32)
+
+
+_REDUCE_NOISE_KERNEL = _reduce_noise_kernel()
+
+# Pillow filter objects are immutable, so build them once rather than per image
+_UNSHARP_MASK_FILTER = ImageFilter.UnsharpMask(radius=1.5, percent=50, threshold=3)
+_REDUCE_NOISE_FILTER = ImageFilter.Kernel((5, 5), _REDUCE_NOISE_KERNEL.ravel().tolist(), scale=1)
+_NOISE_BLUR_FILTER = ImageFilter.GaussianBlur(radius=0.5)
+
+
+def _preprocess_cv2(cv2, img, preprocessing):
+    """OpenCV version of apply_preprocessing, working in place on one array copy."""
+    arr = np.array(img)
+    if preprocessing == 'unsharp_mask':
+        # UnsharpMask(radius=1.5, percent=50, threshold=3): arr + 0.5 * (arr - blur)
+        # wherever |arr - blur| >= 3
+        blur = cv2.GaussianBlur(arr, (0, 0), 1.5)
+        below_threshold = cv2.absdiff(arr, blur) < 3
+        cv2.addWeighted(arr, 1.5, blur, -0.5, 0, dst=blur)
+        np.copyto(blur, arr, where=below_threshold)
+        arr = blur
+    else:
+        arr = cv2.filter2D(arr, -1, _REDUCE_NOISE_KERNEL, borderType=cv2.BORDER_REPLICATE)
+    return Image.fromarray(arr, img.mode)
+
+
+def apply_preprocessing(img, preprocessing):
+    """Apply the 'unsharp_mask' or 'reduce_noise' preprocessing step to img.
+
+    Uses OpenCV when it is installed (in-place ops, no intermediate images),
+    otherwise Pillow's filters. Unknown values return img unchanged.
+    """
+    if preprocessing not in ('unsharp_mask', 'reduce_noise'):
+        return img
+
+    cv2 = _load_cv2()
+    if cv2 is not None and img.mode in ('L', 'RGB', 'RGBA'):
+        return _preprocess_cv2(cv2, img, preprocessing)
+
+    if preprocessing == 'unsharp_mask':
+        return img.filter(_UNSHARP_MASK_FILTER)
+    # Slight blur to reduce noise, then sharpen for detail, as one 5x5 pass
+    try:
+        return img.filter(_REDUCE_NOISE_FILTER)
+    except ValueError:
+        # Kernel filters only support some modes (e.g. not RGBA on older Pillow)
+        blurred = img.filter(_NOISE_BLUR_FILTER)
+        return Image.blend(img, blurred, 0.1).filter(ImageFilter.SHARPEN)
+
+
+def _webp_save_options(width, height, options):
+    """Keyword arguments for Image.save(..., 'WEBP') for an image of the given size."""
+    options = _as_convert_options(options)
+    webp_options = {
+        'quality': options.quality,
+        'method': select_webp_method(width, height, options.method,
+                                     options.webp_method_large,
+                                     options.webp_method_small),
+        'lossless': options.lossless,
+    }
+    return webp_options
+
+
 def convert_single_image(args):
-    """Convert a single image to WebP format with optimized parameters. Runs in a separate process."""
-    img_path, webp_path, options = args
+    """Convert a single image to WebP format with optimized parameters. Runs in a separate process.
 
-    verbose = options.get('verbose', False)
+    ``args`` is ``(img_path, webp_path, options)``, or just ``(img_path, webp_path)``
+    inside a ConversionPool worker whose initializer already installed the options.
+    """
+    if len(args) == 2:
+        img_path, webp_path = args
+        options = _WORKER_OPTIONS
+    else:
+        img_path, webp_path, options = args
+    options = _as_convert_options(options)
+
+    verbose = options.verbose
 
-    def debug_print(*a, **k):
-        if verbose:
-            print(*a, **k)
-    
     # Unpack options
-    quality = options.get('quality', 80)
-    max_width = options.get('max_width', 0)
-    max_height = options.get('max_height', 0)
-    method = options.get('method', 4)
-    preprocessing = options.get('preprocessing')
-    lossless = options.get('lossless', False)
-    grayscale = options.get('grayscale', False)
-    auto_contrast = options.get('auto_contrast', False)
-    auto_greyscale = options.get('auto_greyscale', False)
-    auto_greyscale_pixel_threshold = options.get('auto_greyscale_pixel_threshold', 16)
-    auto_greyscale_percent_threshold = options.get('auto_greyscale_percent_threshold', 0.01)
-    preserve_auto_greyscale_png = options.get('preserve_auto_greyscale_png', False)
-    output_dir = options.get('output_dir')  # For preserve PNG functionality
+    max_width = options.max_width
+    max_height = options.max_height
+    preprocessing = options.preprocessing
+    lossless = options.lossless
+    grayscale = options.grayscale
+    auto_contrast = options.auto_contrast
+    auto_greyscale = options.auto_greyscale
+    auto_greyscale_pixel_threshold = options.auto_greyscale_pixel_threshold
+    auto_greyscale_percent_threshold = options.auto_greyscale_percent_threshold
+    preserve_auto_greyscale_png = options.preserve_auto_greyscale_png
+    fast_resize = options.fast_resize
+    resize_filter = RESIZE_FILTERS.get(options.resize_filter, Image.Resampling.LANCZOS)
     
     try:
         webp_path.parent.mkdir(parents=True, exist_ok=True)
-        with Image.open(img_path) as img:
+        with _open_page(img_path) as img:
+            orig_size = os.fstat(img.fp.fileno()).st_size
+
+            # For JPEG sources let libjpeg decode directly at 1/2, 1/4 or 1/8 scale
+            # (never below the target size); the Lanczos pass below finishes the job.
+            # When the output is forced to greyscale, decode only the luma (Y)
+            # channel: it is the same BT.601 weighting as convert('L'), and skips
+            # chroma upsampling and YCbCr->RGB conversion entirely
+            decoded_as_luma = False
+            if img.format == 'JPEG':
+                draft_mode = 'L' if grayscale and img.mode == 'RGB' else None
+                draft_size = None
+                if (max_width > 0 or max_height > 0) and not lossless:
+                    draft_scale = _fit_scale(img.width, img.height, max_width, max_height)
+                    if draft_scale < 1.0:
+                        draft_size = (max(1, int(img.width * draft_scale)),
+                                      max(1, int(img.height * draft_scale)))
+                if draft_mode or draft_size:
+                    img.draft(draft_mode or img.mode, draft_size)
+                    decoded_as_luma = draft_mode is not None and img.mode == 'L'
+
             # Check if image needs to be converted from CMYK or other modes
             if img.mode not in ('RGB', 'RGBA', 'L', 'LA'):
                 img = img.convert('RGB')
@@ -73,8 +537,9 @@ def convert_single_image(args):
             # Auto-greyscale detection and conversion with enhanced B&W processing
             was_auto_converted = False
             if auto_greyscale and img.mode in ('RGB', 'RGBA'):
-                # Convert to RGB array and drop alpha if present for analysis
-                arr = np.array(img.convert('RGB'))
+                # Analyse the pixels as they are: the colourfulness check ignores
+                # an alpha channel, so an RGB copy via convert() isn't needed
+                arr = np.asarray(img)
                 try:
                     decision = should_convert_to_greyscale(
                         arr,
@@ -82,135 +547,96 @@ def convert_single_image(args):
                         auto_greyscale_percent_threshold
                     )
                 except RuntimeError:
-                    debug_print("DEBUG: Auto-greyscale skipped (NumPy unavailable)")
+                    if verbose:
+                        print("DEBUG: Auto-greyscale skipped (NumPy unavailable)")
                     decision = False
                 if decision:
                     # Debug logging for conversion decision
-                    debug_print(f"DEBUG: Auto-greyscale triggered for {img_path.name}")
-                    debug_print(f"DEBUG: Image mode: {img.mode}, Array shape: {arr.shape}")
+                    if verbose:
+                        print(f"DEBUG: Auto-greyscale triggered for {img_path.name}")
+                        print(f"DEBUG: Image mode: {img.mode}, Array shape: {arr.shape}")
 
                     # Use enhanced B&W conversion like your B&W.py script
                     img = convert_to_bw_with_contrast(img)
                     was_auto_converted = True
-                    debug_print(f"DEBUG: Converted to mode: {img.mode}")
-                else:
-                    debug_print(f"DEBUG: Auto-greyscale NOT triggered for {img_path.name}")
-                    # Show the analysis for debugging
+                    if verbose:
+                        print(f"DEBUG: Converted to mode: {img.mode}")
+                elif verbose:
+                    print(f"DEBUG: Auto-greyscale NOT triggered for {img_path.name}")
+                    # Show the analysis for debugging (only worth recomputing when it is printed)
                     try:
                         max_diff, mean_diff, colored_ratio = analyze_image_colorfulness(
                             arr, auto_greyscale_pixel_threshold
                         )
                     except RuntimeError:
                         max_diff = mean_diff = colored_ratio = 0
-                    debug_print(f"DEBUG: Analysis - max_diff: {max_diff}, mean_diff: {mean_diff:.6f}, colored_ratio: {colored_ratio:.6f}")
-                    debug_print(f"DEBUG: Thresholds - pixel: {auto_greyscale_pixel_threshold}, percent: {auto_greyscale_percent_threshold}")
-            elif auto_greyscale:
-                debug_print(f"DEBUG: Auto-greyscale enabled but image mode is {img.mode}, not RGB/RGBA for {img_path.name}")
-            else:
-                debug_print(f"DEBUG: Auto-greyscale disabled for {img_path.name}")
+                    print(f"DEBUG: Analysis - max_diff: {max_diff}, mean_diff: {mean_diff:.6f}, colored_ratio: {colored_ratio:.6f}")
+                    print(f"DEBUG: Thresholds - pixel: {auto_greyscale_pixel_threshold}, percent: {auto_greyscale_percent_threshold}")
+            elif verbose:
+                if auto_greyscale:
+                    print(f"DEBUG: Auto-greyscale enabled but image mode is {img.mode}, not RGB/RGBA for {img_path.name}")
+                else:
+                    print(f"DEBUG: Auto-greyscale disabled for {img_path.name}")
             
             # Manual grayscale conversion if requested (overrides auto-detection)
-            if grayscale and img.mode != 'L':
+            if grayscale and (img.mode != 'L' or decoded_as_luma):
                 # Use enhanced B&W conversion for manual grayscale too
                 img = convert_to_bw_with_contrast(img)
             
             # Apply additional auto-contrast if requested (for non-grayscale images)
             if auto_contrast and img.mode != 'L':
-                try:
-                    from PIL import ImageOps
-                    img = ImageOps.autocontrast(img, cutoff=0.5)
-                except (ImportError, AttributeError):
-                    pass  # Skip if not available
-            
-            # Resize if needed
-            width, height = img.size
-            scale_factor = 1.0
-
-            if max_width > 0 and width > max_width:
-                scale_factor = min(scale_factor, max_width / width)
-            if max_height > 0 and height > max_height:
-                scale_factor = min(scale_factor, max_height / height)
-
-            if scale_factor < 1.0:
-                new_w = int(width * scale_factor)
-                new_h = int(height * scale_factor)
-                img = img.resize((new_w, new_h), Image.Resampling.LANCZOS)
+                img = ImageOps.autocontrast(img, cutoff=0.5)
             
+            # Resize if needed (most presets set no size limit at all)
+            if max_width > 0 or max_height > 0:
+                width, height = img.size
+                scale_factor = _fit_scale(width, height, max_width, max_height)
+                new_w = max(1, int(width * scale_factor))
+                new_h = max(1, int(height * scale_factor))
+                if (new_w, new_h) != (width, height):
+                    if fast_resize and scale_factor < 0.5:
+                        # Large downscale: cheap bilinear pre-shrink to ~1.25x the target
+                        # so the Lanczos pass only has to touch a fraction of the pixels
+                        pre_w = max(new_w, int(width * scale_factor * 1.25))
+                        pre_h = max(new_h, int(height * scale_factor * 1.25))
+                        img = img.resize((pre_w, pre_h), Image.Resampling.BILINEAR)
+                    # reducing_gap lets Pillow box-reduce by an integer factor first
+                    # whenever the remaining ratio is still over 3x, then run Lanczos
+                    img = img.resize((new_w, new_h), resize_filter,
+                                     reducing_gap=RESIZE_REDUCING_GAP)
+
             # Apply preprocessing if requested
-            if preprocessing == 'unsharp_mask':
-                try:
-                    from PIL import ImageFilter
-                    img = img.filter(ImageFilter.UnsharpMask(radius=1.5, percent=50, threshold=3))
-                except (ImportError, AttributeError):
-                    pass  # Skip if not available
-            elif preprocessing == 'reduce_noise':
-                try:
-                    from PIL import ImageFilter
-                    # Apply slight blur to reduce noise, then sharpen for detail
-                    blurred = img.filter(ImageFilter.GaussianBlur(radius=0.5))
-                    img = Image.blend(img, blurred, 0.1).filter(ImageFilter.SHARPEN)
-                except (ImportError, AttributeError):
-                    pass  # Skip if not available
-
-            # For B&W images, create intermediate PNG for better quality pipeline
-            # This mimics your B&W.py script workflow: Source -> B&W PNG -> WebP
-            if img.mode == 'L' and (was_auto_converted or grayscale):
-                debug_print(f"DEBUG: Creating intermediate PNG for {img_path.name} (mode={img.mode}, was_auto_converted={was_auto_converted}, grayscale={grayscale})")
-                import tempfile
-                import os
-                from pathlib import Path
-                
-                # Determine PNG path - either temporary or preserved
-                if preserve_auto_greyscale_png and output_dir:
-                    # Create a preserved PNG alongside the WebP
-                    png_path = webp_path.with_suffix('.png')
-                    delete_png = False
-                    debug_print(f"DEBUG: Preserving PNG at {png_path}")
-                else:
-                    # Create temporary PNG file for B&W processing
-                    with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as tmp_png:
-                        png_path = tmp_png.name
-                    delete_png = True
-                    debug_print(f"DEBUG: Using temporary PNG at {png_path}")
-                
-                try:
-                    # Save as PNG first (like your B&W.py script)
-                    img.save(png_path, 'PNG')
-                    
-                    # Reload from PNG for WebP conversion
-                    with Image.open(png_path) as png_img:
-                        # WebP parameters
-                        webp_options = {
-                            'quality': quality,
-                            'method': method,
-                            'lossless': lossless,
-                        }
-                        
-                        # Convert PNG to WebP
-                        png_img.save(webp_path, 'WEBP', **webp_options)
-                finally:
-                    # Clean up temporary PNG file only if not preserving
-                    if delete_png:
-                        try:
-                            os.unlink(png_path)
-                        except OSError:
-                            pass  # Ignore cleanup errors
-            else:
-                # Standard conversion for color images
-                debug_print(f"DEBUG: Using standard WebP conversion for {img_path.name} (mode={img.mode}, was_auto_converted={was_auto_converted}, grayscale={grayscale})")
-                # WebP parameters
-                webp_options = {
-                    'quality': quality,
-                    'method': method,
-                    'lossless': lossless,
-                }
-                
-                # Standard saving with specified options
-                img.save(webp_path, 'WEBP', **webp_options)
+            if preprocessing:
+                img = apply_preprocessing(img, preprocessing)
+
+            webp_options = _webp_save_options(img.width, img.height, options)
+
+            # B&W pages used to go Source -> PNG -> WebP; PNG is lossless, so the
+            # round trip produced the same pixels and the WebP is now encoded
+            # straight from the in-memory image. The PNG is still written when
+            # asked to preserve it for debugging
+            if preserve_auto_greyscale_png and img.mode == 'L' and (was_auto_converted or grayscale):
+                png_path = webp_path.with_suffix('.png')
+                if verbose:
+                    print(f"DEBUG: Preserving PNG at {png_path}")
+                img.save(png_path, 'PNG')
+            if verbose:
+                print(f"DEBUG: Encoding WebP for {img_path.name} (mode={img.mode}, was_auto_converted={was_auto_converted}, grayscale={grayscale})")
+            img.save(webp_path, 'WEBP', **webp_options)
 
-        return (img_path, webp_path, True, None, was_auto_converted)
+        webp_size = os.path.getsize(webp_path)
+        return (img_path, webp_path, True, None, was_auto_converted, orig_size, webp_size)
     except Exception as e:
-        return (img_path, webp_path, False, str(e), False)
+        return (img_path, webp_path, False, str(e), False, 0, 0)
+
+
+def _copy_non_images(non_image_files, output_dir):
+    """Copy ``(path, relpath)`` files into output_dir unchanged; returns the count."""
+    for file_path, rel_path in non_image_files:
+        output_path = output_dir / rel_path
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        FileSystemUtils.copy_file(file_path, output_path)
+    return len(non_image_files)
 
 
 def convert_to_webp(
@@ -231,14 +657,22 @@ def convert_to_webp(
     auto_greyscale_percent_threshold=0.01,
     preserve_auto_greyscale_png=False,
     verbose=False,
+    fast_resize=False,
+    webp_method_large=None,
+    webp_method_small=None,
+    executor=None,
+    use_threads=False,
+    resize_filter='lanczos',
+    conversion_gate=None,
 ):
-    """Convert all images in extract_dir to WebP format and copy all non-image files to output_dir."""
-    import os
-    import shutil
-    from pathlib import Path
-    import multiprocessing
-    from concurrent.futures import ProcessPoolExecutor, as_completed
+    """Convert all images in extract_dir to WebP format and copy all non-image files to output_dir.
 
+    If ``executor`` is given, conversions are submitted to that (shared) pool instead
+    of spinning up a fresh pool for this directory; that pool converts on threads
+    rather than processes if ``use_threads`` is set. Callers converting several
+    directories at once pass one ConversionGate, so a directory whose pages
+    need a memory-capped pool converts alone.
+    """
     # Ensure logger is always callable
     if logger is None:
         class _NullLogger:
@@ -246,33 +680,27 @@ def convert_to_webp(
             def info(self, *a, **k): pass
             def warning(self, *a, **k): pass
             def error(self, *a, **k): pass
+            def isEnabledFor(self, level): return False
         logger = _NullLogger()
     image_files = []
     non_image_files = []
 
-    for root, _, files in os.walk(extract_dir):
-        for file in files:
-            file_path = Path(root) / file
-            if ImageAnalyzer.is_image_file(file_path) and file_path.suffix.lower() != '.webp':
-                image_files.append(file_path)
-            else:
-                non_image_files.append(file_path)
+    for file_path, rel_path in _iter_files(extract_dir):
+        head, dot, ext = rel_path.rpartition('.')
+        if dot and head and ext.lower() in _CONVERTIBLE_EXTS:
+            image_files.append((file_path, rel_path))
+        else:
+            non_image_files.append((file_path, rel_path))
 
     image_files.sort()
     non_image_files.sort()
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    # Process non-image files first - simply copy them to output directory
-    copied_count = 0
-    for file_path in non_image_files:
-        rel_path = file_path.relative_to(extract_dir)
-        output_path = output_dir / rel_path
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        shutil.copy2(file_path, output_path)
-        copied_count += 1
-
-    if copied_count > 0:
-        logger.info(f"Copied {copied_count} non-image files to preserve metadata and auxiliary content")
+    # Copy non-image files on a background thread: it is I/O bound and their
+    # destinations never collide with the WebP outputs, so it overlaps the encode
+    copier = ThreadPoolExecutor(max_workers=1)
+    copy_future = copier.submit(_copy_non_images, non_image_files, output_dir)
+    copier.shutdown(wait=False)
 
     # Continue with image conversion as before
     if num_threads <= 0:
@@ -286,6 +714,14 @@ def convert_to_webp(
         additional_params.append("grayscale=True (enhanced B&W conversion)")
     if auto_contrast:
         additional_params.append("auto_contrast=True")
+    if fast_resize:
+        additional_params.append("fast_resize=True")
+    if webp_method_large is not None:
+        additional_params.append(f"webp_method_large={webp_method_large}")
+    if webp_method_small is not None:
+        additional_params.append(f"webp_method_small={webp_method_small}")
+    if resize_filter != 'lanczos':
+        additional_params.append(f"resize_filter={resize_filter}")
     if auto_greyscale:
         additional_params.append(f"auto_greyscale=True (enhanced B&W, pixel_threshold={auto_greyscale_pixel_threshold}, percent_threshold={auto_greyscale_percent_threshold})")
     
@@ -295,31 +731,32 @@ def convert_to_webp(
     
     logger.info(f"WebP parameters: {params_str}")
 
-    # Package options for each image
-    conversion_args = []
-    for img_path in image_files:
-        rel_path = img_path.relative_to(extract_dir)
-        webp_path = output_dir / rel_path.with_suffix('.webp')
-        
-        # Create options dictionary for this image
-        options = {
-            'quality': quality,
-            'max_width': max_width,
-            'max_height': max_height,
-            'method': method,
-            'preprocessing': preprocessing,
-            'lossless': lossless,
-            'grayscale': grayscale,
-            'auto_contrast': auto_contrast,
-            'auto_greyscale': auto_greyscale,
-            'auto_greyscale_pixel_threshold': auto_greyscale_pixel_threshold,
-            'auto_greyscale_percent_threshold': auto_greyscale_percent_threshold,
-            'preserve_auto_greyscale_png': preserve_auto_greyscale_png,
-            'output_dir': output_dir,  # For preserve PNG functionality
-            'verbose': verbose,
-        }
-        
-        conversion_args.append((img_path, webp_path, options))
+    # One ConvertOptions for the whole directory; if the shared pool was initialised
+    # with the same options, only the path pairs need to cross the process boundary
+    options = build_conversion_options(
+        quality=quality,
+        max_width=max_width,
+        max_height=max_height,
+        method=method,
+        preprocessing=preprocessing,
+        lossless=lossless,
+        grayscale=grayscale,
+        auto_contrast=auto_contrast,
+        auto_greyscale=auto_greyscale,
+        auto_greyscale_pixel_threshold=auto_greyscale_pixel_threshold,
+        auto_greyscale_percent_threshold=auto_greyscale_percent_threshold,
+        preserve_auto_greyscale_png=preserve_auto_greyscale_png,
+        verbose=verbose,
+        fast_resize=fast_resize,
+        webp_method_large=webp_method_large,
+        webp_method_small=webp_method_small,
+        resize_filter=resize_filter,
+    )
+    path_pairs = [
+        (Path(img_path), (output_dir / rel_path).with_suffix('.webp'))
+        for img_path, rel_path in image_files
+    ]
+    conversion_args = [(img_path, webp_path, options) for img_path, webp_path in path_pairs]
 
     # Process images with enhanced reporting
     success_count = 0
@@ -327,49 +764,74 @@ def convert_to_webp(
     total_webp_size = 0
     auto_converted_count = 0
     
-    with ProcessPoolExecutor(max_workers=num_threads) as executor:
-        futures = [executor.submit(convert_single_image, args) for args in conversion_args]
-        for i, fut in enumerate(as_completed(futures), 1):
-            result = fut.result()
-            if len(result) == 5:  # Enhanced result with auto-conversion info
-                img_path, webp_path, success, error, was_auto_converted = result
-            else:  # Backward compatibility
-                img_path, webp_path, success, error = result
-                was_auto_converted = False
-                
-            if success:
-                # Calculate compression ratio for reporting
-                try:
-                    orig_size = img_path.stat().st_size
-                    webp_size = webp_path.stat().st_size
+    run_inline = _should_convert_inline(conversion_args, num_threads)
+    memory_capped = False
+    if not run_inline:
+        max_workers = memory_capped_workers(num_threads, path_pairs[0][0])
+        if max_workers < num_threads:
+            memory_capped = True
+            logger.info(f"Limiting conversion to {max_workers} workers so decoded images fit in available memory")
+            num_threads = max_workers
+            if getattr(executor, 'max_workers', 0) > max_workers:
+                executor = None  # The shared pool is too wide for these images
+    gate = conversion_gate.hold(exclusive=memory_capped) if conversion_gate is not None else nullcontext()
+    with gate:
+        own_executor = executor is None and not run_inline
+        if own_executor:
+            executor = make_conversion_pool(num_threads, options, use_threads)
+        if not run_inline and getattr(executor, 'options', None) == options:
+            conversion_args = path_pairs
+        try:
+            if run_inline:
+                logger.debug("Converting inline (too few/small images to benefit from the process pool)")
+                results = map(convert_single_image, conversion_args)
+            else:
+                # Hand work to the pool in chunks so each worker round-trip covers several
+                # images instead of pickling one task (and one result) per page, and
+                # take results in completion order
+                chunksize = max(1, len(conversion_args) // (num_threads * 4))
+                results = imap_unordered(executor, convert_single_image, conversion_args, chunksize=chunksize)
+            # Per-image lines are only formatted when DEBUG is actually enabled
+            log_each_image = logger.isEnabledFor(logging.DEBUG)
+            for i, result in enumerate(results, 1):
+                # Sizes come back from the worker, which already had both files open
+                img_path, webp_path, success, error, was_auto_converted, orig_size, webp_size = result
+
+                if success:
                     total_orig_size += orig_size
                     total_webp_size += webp_size
-                    
-                    savings_pct = (1 - webp_size / orig_size) * 100 if orig_size > 0 else 0
-                    
                     success_count += 1
                     if was_auto_converted:
                         auto_converted_count += 1
-                    
-                    # Enhanced conversion notes
-                    conversion_note = ""
-                    if was_auto_converted:
-                        conversion_note = " [auto→B&W+contrast]"
-                    elif grayscale:
-                        conversion_note = " [manual→B&W+contrast]"
-                    
-                    logger.debug(
-                        f"[{i}/{len(image_files)}] Converted: {img_path.name} -> {webp_path.name}{conversion_note} "
-                        f"({savings_pct:.1f}% smaller, {orig_size/1024:.1f}KB → {webp_size/1024:.1f}KB)"
-                    )
-                except Exception as e:
-                    logger.debug(f"[{i}/{len(image_files)}] Converted: {img_path.name} -> {webp_path.name}")
-                    logger.debug(f"Error calculating file size: {e}")
-                    success_count += 1
-                    if was_auto_converted:
-                        auto_converted_count += 1
-            else:
-                logger.error(f"Error converting {img_path.name}: {error}")
+
+                    if log_each_image:
+                        savings_pct = (1 - webp_size / orig_size) * 100 if orig_size > 0 else 0
+
+                        # Enhanced conversion notes
+                        conversion_note = ""
+                        if was_auto_converted:
+                            conversion_note = " [auto→B&W+contrast]"
+                        elif grayscale:
+                            conversion_note = " [manual→B&W+contrast]"
+
+                        logger.debug(
+                            f"[{i}/{len(image_files)}] Converted: {img_path.name} -> {webp_path.name}{conversion_note} "
+                            f"({savings_pct:.1f}% smaller, {orig_size/1024:.1f}KB → {webp_size/1024:.1f}KB)"
+                        )
+                else:
+                    logger.error(f"Error converting {img_path.name}: {error}")
+
+                if i % PROGRESS_LOG_INTERVAL == 0 and i < len(image_files):
+                    running_pct = (1 - total_webp_size / total_orig_size) * 100 if total_orig_size > 0 else 0
+                    logger.info(f"Converted {i}/{len(image_files)} images ({running_pct:.1f}% smaller so far)")
+        finally:
+            if own_executor:
+                executor.shutdown()
+            wait([copy_future])
+
+    copied_count = copy_future.result()
+    if copied_count > 0:
+        logger.info(f"Copied {copied_count} non-image files to preserve metadata and auxiliary content")
 
     # Report overall compression ratio and auto-conversion stats
     if total_orig_size > 0:
@@ -397,7 +859,10 @@ def cbz_packaging_worker(packaging_queue, logger, keep_originals):
             break
 
         # Handle both old and new item formats
-        if len(item) >= 6:
+        sevenzip_method = 'lzma2'  # Default
+        if len(item) >= 7:
+            file_output_dir, archive_output, input_file, result_dict, format_type, zip_compresslevel, sevenzip_method = item
+        elif len(item) >= 6:
             file_output_dir, archive_output, input_file, result_dict, format_type, zip_compresslevel = item
         elif len(item) >= 5:
             file_output_dir, archive_output, input_file, result_dict, zip_compresslevel = item
@@ -408,7 +873,7 @@ def cbz_packaging_worker(packaging_queue, logger, keep_originals):
             zip_compresslevel = 9  # Default
         
         success, new_size = worker.package_single(
-            file_output_dir, archive_output, input_file, format_type, zip_compresslevel
+            file_output_dir, archive_output, input_file, format_type, zip_compresslevel, sevenzip_method
         )
         
         result_dict["success"] = success
@@ -439,25 +904,32 @@ def process_single_file(
     auto_greyscale_percent_threshold=0.01, # Percentage threshold for auto-greyscale
     preserve_auto_greyscale_png=False,     # Preserve intermediate PNG files for debugging
     output_format='cbz',   # Output archive format
-    verbose=False
+    sevenzip_method='lzma2',  # 7Z/CB7 compressor: 'lzma2' or 'zstd'
+    verbose=False,
+    fast_resize=False,     # Bilinear pre-shrink before Lanczos on large downscales
+    webp_method_large=None,  # WebP method for images over LARGE_IMAGE_PIXELS
+    webp_method_small=None,  # WebP method for smaller images
+    executor=None,         # Optional shared conversion pool (see process_archive_files)
+    use_threads=False,     # Convert on threads instead of worker processes
+    resize_filter='lanczos',  # Filter for the final resize pass (see RESIZE_FILTERS)
+    extract_dir=None,      # Already-extracted contents of input_file (owned by the caller)
+    conversion_gate=None   # ConversionGate shared by archives converting at once
 ):
     """Process a single CBZ/CBR file with optimized parameters from presets."""
-    from .utils import get_file_size_formatted
-    import os
-    import shutil
-    import tempfile
-    from pathlib import Path
-
     # Create file-specific output directory within the output_dir
     file_output_dir = output_dir / input_file.stem
     orig_size_str, orig_size_bytes = FileSystemUtils.get_file_size_formatted(input_file)
     new_size_bytes = 0  # Default value
 
-    with tempfile.TemporaryDirectory() as temp_dir:
+    if extract_dir is None:
+        scratch = tempfile.TemporaryDirectory(dir=FileSystemUtils.scratch_dir(orig_size_bytes))
+    else:
+        scratch = nullcontext(extract_dir)
+    with scratch as temp_dir:
         temp_path = Path(temp_dir)
         try:
-            from .archives import extract_archive, create_cbz
-            extract_archive(input_file, temp_path, logger)
+            if extract_dir is None:
+                extract_archive(input_file, temp_path, logger)
             convert_to_webp(
                 temp_path,
                 file_output_dir,
@@ -476,19 +948,26 @@ def process_single_file(
                 auto_greyscale_percent_threshold,
                 preserve_auto_greyscale_png,
                 verbose=verbose,
+                fast_resize=fast_resize,
+                webp_method_large=webp_method_large,
+                webp_method_small=webp_method_small,
+                executor=executor,
+                use_threads=use_threads,
+                resize_filter=resize_filter,
+                conversion_gate=conversion_gate,
             )
 
             if not no_cbz:
                 # Get the correct extension for the output format
-                from .core.archive_handler import ArchiveHandler
                 extension = ArchiveHandler.get_extension_for_format(output_format)
                 archive_output = output_dir / f"{input_file.stem}{extension}"
                 
                 # If using pipelined approach
                 if packaging_queue is not None:
                     result_dict = {"success": False, "new_size": 0}
-                    # Include the format type and compression level in the queue item
-                    packaging_queue.put((file_output_dir, archive_output, input_file, result_dict, output_format, zip_compresslevel))
+                    # Include the format type and compression settings in the queue item
+                    packaging_queue.put((file_output_dir, archive_output, input_file, result_dict, output_format,
+                                         zip_compresslevel, sevenzip_method))
                     logger.info(f"Queued {input_file.name} for packaging")
                     # Return the orig_size_bytes and a placeholder for new_size
                     # The actual size will be determined by the packaging worker
@@ -496,14 +975,14 @@ def process_single_file(
                     return True, orig_size_bytes, 0  # Return 0 for new_size, will be updated by worker
                 else:
                     # Synchronous approach - use the new create_archive method
-                    from .archives import create_archive
-                    create_archive(file_output_dir, archive_output, output_format, logger, zip_compresslevel)
+                    create_archive(file_output_dir, archive_output, output_format, logger, zip_compresslevel,
+                                   sevenzip_method)
                     new_size_str, new_size_bytes = FileSystemUtils.get_file_size_formatted(archive_output)
                     size_diff_bytes = orig_size_bytes - new_size_bytes
 
                     if orig_size_bytes > 0:
                         pct_saved = (size_diff_bytes / orig_size_bytes) * 100
-                        diff_str, _ = get_file_size_formatted(abs(size_diff_bytes))
+                        diff_str, _ = FileSystemUtils.get_file_size_formatted(abs(size_diff_bytes))
                         logger.info(f"Compression Report for {input_file.name}:")
                         logger.info(f"  Original size: {orig_size_str}")
                         logger.info(f"  New size: {new_size_str}")
@@ -514,12 +993,12 @@ def process_single_file(
                             logger.info(f"  Space increased: {diff_str} ({abs(pct_saved):.1f}% larger)")
 
                     if not keep_originals:
-                        shutil.rmtree(file_output_dir)
+                        FileSystemUtils.fast_rmtree(file_output_dir)
                         logger.debug(f"Removed extracted files from {file_output_dir}")
             else:
                 # For no_cbz mode, we still want to count the size of the extracted files
                 # This is not perfect but provides an estimate
-                new_size_bytes = sum(f.stat().st_size for f in file_output_dir.glob('**/*') if f.is_file())
+                new_size_bytes = FileSystemUtils.get_directory_size(file_output_dir)
 
             logger.info(f"Conversion of {input_file.name} completed successfully!")
             return True, orig_size_bytes, new_size_bytes
@@ -529,6 +1008,103 @@ def process_single_file(
             return False, orig_size_bytes, 0
 
 
+def conversion_options_from_args(args):
+    """Build the conversion options that convert_to_webp() derives from these CLI args.
+
+    Used to initialise a ConversionPool shared across archives; convert_to_webp()
+    only sends bare path pairs to a pool whose options match its own.
+    """
+    return build_conversion_options(
+        quality=args.quality,
+        max_width=args.max_width,
+        max_height=args.max_height,
+        method=args.method,
+        preprocessing=args.preprocessing,
+        lossless=args.lossless,
+        grayscale=args.grayscale,
+        auto_contrast=args.auto_contrast,
+        auto_greyscale=getattr(args, 'auto_greyscale', False),
+        auto_greyscale_pixel_threshold=getattr(args, 'auto_greyscale_pixel_threshold', 16),
+        auto_greyscale_percent_threshold=getattr(args, 'auto_greyscale_percent_threshold', 0.01),
+        preserve_auto_greyscale_png=getattr(args, 'preserve_auto_greyscale_png', False),
+        verbose=args.verbose,
+        fast_resize=getattr(args, 'fast_resize', False),
+        webp_method_large=getattr(args, 'webp_method_large', None),
+        webp_method_small=getattr(args, 'webp_method_small', None),
+        resize_filter=getattr(args, 'resize_filter', 'lanczos'),
+    )
+
+
+def prefetch_extractions(archives, logger, depth=2, cleanup=True):
+    """
+    Yield (archive, extract_dir) pairs while a background thread extracts ahead.
+
+    Extraction is mostly I/O, so archive N+1 is unpacked while archive N is
+    being converted (and N-1 packaged). At most ``depth`` extracted archives
+    wait in the queue, bounding the temp space in use. Each extract_dir is
+    removed once the consumer moves on, unless ``cleanup`` is False, in which
+    case the consumer owns it; it is None if extraction failed (the error has
+    already been logged).
+    """
+    extracted = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+
+    def extraction_worker():
+        for archive in archives:
+            if stop.is_set():
+                break
+            try:
+                size_hint = os.path.getsize(archive)
+            except OSError:
+                size_hint = 0
+            temp_path = Path(tempfile.mkdtemp(prefix='cbxtools_', dir=FileSystemUtils.scratch_dir(size_hint)))
+            try:
+                extract_archive(archive, temp_path, logger)
+            except Exception as e:
+                logger.error(f"Error extracting {archive}: {e}")
+                shutil.rmtree(temp_path, ignore_errors=True)
+                temp_path = None
+            extracted.put((archive, temp_path))
+        extracted.put(None)
+
+    extraction_thread = threading.Thread(target=extraction_worker, daemon=True)
+    extraction_thread.start()
+    try:
+        while True:
+            item = extracted.get()
+            if item is None:
+                break
+            archive, temp_path = item
+            try:
+                yield archive, temp_path
+            finally:
+                if cleanup and temp_path is not None:
+                    shutil.rmtree(temp_path, ignore_errors=True)
+    finally:
+        # If the consumer stopped early, unblock the worker and discard
+        # whatever it extracted ahead
+        stop.set()
+        while extraction_thread.is_alive() or not extracted.empty():
+            try:
+                item = extracted.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if item is not None and item[1] is not None:
+                shutil.rmtree(item[1], ignore_errors=True)
+        extraction_thread.join()
+
+
+# Archives converted at once through the shared pool. With two in flight, the
+# next archive's pages are already queued when the current one's last pages are
+# being encoded, so workers don't idle at every archive boundary.
+CONCURRENT_ARCHIVES = 2
+
+
+def packaging_worker_count(num_archives):
+    """Number of packaging threads for a pipelined batch: a quarter of the CPUs, at least one."""
+    return max(1, min(num_archives, multiprocessing.cpu_count() // 4))
+
+
 def process_archive_files(archives, output_dir, args, logger):
     """Process multiple archives with pipelining for improved performance."""
     total_original_size = 0
@@ -546,6 +1122,10 @@ def process_archive_files(archives, output_dir, args, logger):
     auto_greyscale_pixel_threshold = getattr(args, 'auto_greyscale_pixel_threshold', 16)
     auto_greyscale_percent_threshold = getattr(args, 'auto_greyscale_percent_threshold', 0.01)
     preserve_auto_greyscale_png = getattr(args, 'preserve_auto_greyscale_png', False)
+    fast_resize = getattr(args, 'fast_resize', False)
+    webp_method_large = getattr(args, 'webp_method_large', None)
+    webp_method_small = getattr(args, 'webp_method_small', None)
+    resize_filter = getattr(args, 'resize_filter', 'lanczos')
     
     # Report which parameters we're using
     params_str = f"method={method}, preprocessing={preprocessing}, zip_compression={zip_compression}, lossless={lossless}"
@@ -553,100 +1133,152 @@ def process_archive_files(archives, output_dir, args, logger):
         params_str += f", grayscale={grayscale}"
     if auto_contrast:
         params_str += f", auto_contrast={auto_contrast}"
+    if fast_resize:
+        params_str += f", fast_resize={fast_resize}"
+    if webp_method_large is not None:
+        params_str += f", webp_method_large={webp_method_large}"
+    if webp_method_small is not None:
+        params_str += f", webp_method_small={webp_method_small}"
+    if resize_filter != 'lanczos':
+        params_str += f", resize_filter={resize_filter}"
     if auto_greyscale:
         preserve_note = ", preserve_png=True" if preserve_auto_greyscale_png else ""
         params_str += f", auto_greyscale={auto_greyscale} (pixel_threshold={auto_greyscale_pixel_threshold}, percent_threshold={auto_greyscale_percent_threshold}{preserve_note})"
     
     logger.info(f"Processing with parameters: {params_str}")
 
-    if not args.no_cbz and len(archives) > 1:
-        logger.info(f"Processing {len(archives)} comics with pipelined approach...")
+    pipelined = not args.no_cbz and len(archives) > 1
+    if pipelined:
         # Reserve 1 thread for packaging, the rest for conversion
         conversion_threads = max(1, args.threads - 1) if args.threads > 0 else max(1, multiprocessing.cpu_count() - 1)
-        packaging_queue = queue.Queue()
-        packaging_thread = threading.Thread(
-            target=cbz_packaging_worker,
-            args=(packaging_queue, logger, args.keep_originals),
-            daemon=True
-        )
-        packaging_thread.start()
-
-        success_count = 0
-        result_dicts = []
-
-        for i, archive in enumerate(archives, 1):
-            logger.info(f"\n[{i}/{len(archives)}] Processing: {archive}")
-            success, orig_size, _ = process_single_file(
-                input_file=archive,
-                output_dir=output_dir,
-                quality=args.quality,
-                max_width=args.max_width,
-                max_height=args.max_height,
-                no_cbz=args.no_cbz,
-                keep_originals=args.keep_originals,
-                num_threads=conversion_threads,
-                logger=logger,
-                packaging_queue=packaging_queue,
-                method=method,
-                preprocessing=preprocessing,
-                zip_compresslevel=zip_compression,
-                lossless=lossless,
-                grayscale=grayscale,
-                auto_contrast=auto_contrast,
-                auto_greyscale=auto_greyscale,
-                auto_greyscale_pixel_threshold=auto_greyscale_pixel_threshold,
-                auto_greyscale_percent_threshold=auto_greyscale_percent_threshold,
-                preserve_auto_greyscale_png=preserve_auto_greyscale_png,
-                output_format=getattr(args, 'output', 'cbz'),
-                verbose=args.verbose
-            )
-            if success:
-                success_count += 1
-                total_original_size += orig_size
-                # We'll get the new_size from the result_dict later
-                result_dicts.append((archive.name, orig_size))
+    else:
+        conversion_threads = args.threads if args.threads > 0 else multiprocessing.cpu_count()
 
-        # Send sentinel to stop packager
-        packaging_queue.put(None)
-        packaging_queue.join()
-        packaging_thread.join()
+    # One conversion pool for the whole batch instead of one per archive; the
+    # workers receive the (batch-wide) conversion options once, at startup
+    use_threads = getattr(args, 'thread_pool', False)
+    executor = make_conversion_pool(
+        conversion_threads, conversion_options_from_args(args), use_threads
+    )
+    packaging_queue = None
+    packaging_threads = []
+    success_count = 0
+    try:
+        if pipelined:
+            logger.info(f"Processing {len(archives)} comics with pipelined approach...")
+            packaging_queue = queue.Queue()
+            # Several packagers so DEFLATE doesn't serialise behind one thread;
+            # zlib releases the GIL while compressing, so threads scale
+            packaging_threads = [
+                threading.Thread(
+                    target=cbz_packaging_worker,
+                    args=(packaging_queue, logger, args.keep_originals),
+                    daemon=True
+                )
+                for _ in range(packaging_worker_count(len(archives)))
+            ]
+            for packaging_thread in packaging_threads:
+                packaging_thread.start()
 
-        # For pipelined approach, we don't have accurate size information yet
-        # since packaging happens asynchronously
-        logger.warning("Note: Size statistics may be incomplete for pipelined processing")
-        processed_files = [(filename, orig_size, 0) for filename, orig_size in result_dicts]
+        def convert_archive(i, archive, extract_dir):
+            try:
+                return i, archive, process_single_file(
+                    input_file=archive,
+                    output_dir=output_dir,
+                    quality=args.quality,
+                    max_width=args.max_width,
+                    max_height=args.max_height,
+                    no_cbz=args.no_cbz,
+                    keep_originals=args.keep_originals,
+                    num_threads=conversion_threads,
+                    logger=logger,
+                    executor=executor,
+                    packaging_queue=packaging_queue,
+                    method=method,
+                    preprocessing=preprocessing,
+                    zip_compresslevel=zip_compression,
+                    lossless=lossless,
+                    grayscale=grayscale,
+                    auto_contrast=auto_contrast,
+                    auto_greyscale=auto_greyscale,
+                    auto_greyscale_pixel_threshold=auto_greyscale_pixel_threshold,
+                    auto_greyscale_percent_threshold=auto_greyscale_percent_threshold,
+                    preserve_auto_greyscale_png=preserve_auto_greyscale_png,
+                    output_format=getattr(args, 'output', 'cbz'),
+                    sevenzip_method=getattr(args, 'sevenzip_method', 'lzma2'),
+                    verbose=args.verbose,
+                    fast_resize=fast_resize,
+                    webp_method_large=webp_method_large,
+                    webp_method_small=webp_method_small,
+                    use_threads=use_threads,
+                    resize_filter=resize_filter,
+                    extract_dir=extract_dir,
+                    conversion_gate=gate
+                )
+            finally:
+                shutil.rmtree(extract_dir, ignore_errors=True)
 
-    else:
-        success_count = 0
-        for i, archive in enumerate(archives, 1):
-            logger.info(f"\n[{i}/{len(archives)}] Processing: {archive}")
-            success, orig_size, new_sz = process_single_file(
-                input_file=archive,
-                output_dir=output_dir,
-                quality=args.quality,
-                max_width=args.max_width,
-                max_height=args.max_height,
-                no_cbz=args.no_cbz,
-                keep_originals=args.keep_originals,
-                num_threads=args.threads,
-                logger=logger,
-                method=method,
-                preprocessing=preprocessing,
-                zip_compresslevel=zip_compression,
-                lossless=lossless,
-                grayscale=grayscale,
-                auto_contrast=auto_contrast,
-                auto_greyscale=auto_greyscale,
-                auto_greyscale_pixel_threshold=auto_greyscale_pixel_threshold,
-                auto_greyscale_percent_threshold=auto_greyscale_percent_threshold,
-                preserve_auto_greyscale_png=preserve_auto_greyscale_png,
-                output_format=getattr(args, 'output', 'cbz'),
-                verbose=args.verbose
-            )
+        def record(result):
+            nonlocal success_count, total_original_size, total_new_size
+            i, archive, (success, orig_size, new_sz) = result
             if success:
                 success_count += 1
                 total_original_size += orig_size
                 total_new_size += new_sz
-                processed_files.append((archive.name, orig_size, new_sz))
+                # In pipelined mode new_sz is 0: packaging happens asynchronously
+                processed_files.append((i, archive.name, orig_size, new_sz))
+
+        def drain():
+            # Let every archive started so far finish, packaging included
+            nonlocal in_flight
+            for future in as_completed(in_flight):
+                record(future.result())
+            in_flight = set()
+            if packaging_queue is not None:
+                packaging_queue.join()
+            stems_in_use.clear()
+
+        # Each driver thread walks one archive through convert_to_webp(); their
+        # pages all land in the one shared pool's queue. An archive whose stem
+        # (and so its output_dir/<stem> working folder and output archive) was
+        # already used in this round runs after everything before it has
+        # finished. An archive whose pages get a memory-capped pool of their
+        # own converts alone: convert_to_webp() holds the gate exclusively.
+        gate = ConversionGate()
+        in_flight = set()
+        stems_in_use = set()
+        with ThreadPoolExecutor(max_workers=CONCURRENT_ARCHIVES) as drivers:
+            extractions = prefetch_extractions(archives, logger, cleanup=False)
+            for i, (archive, extract_dir) in enumerate(extractions, 1):
+                logger.info(f"\n[{i}/{len(archives)}] Processing: {archive}")
+                if extract_dir is None:
+                    continue
+                stem = archive.stem.casefold()
+                if stem in stems_in_use:
+                    drain()
+                stems_in_use.add(stem)
+                if len(in_flight) >= CONCURRENT_ARCHIVES:
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        record(future.result())
+                in_flight.add(drivers.submit(convert_archive, i, archive, extract_dir))
+            for future in as_completed(in_flight):
+                record(future.result())
+
+        if pipelined:
+            # Send one sentinel per packager to stop them
+            for _ in packaging_threads:
+                packaging_queue.put(None)
+            packaging_queue.join()
+            for packaging_thread in packaging_threads:
+                packaging_thread.join()
+
+            # For pipelined approach, we don't have accurate size information yet
+            # since packaging happens asynchronously
+            logger.warning("Note: Size statistics may be incomplete for pipelined processing")
+    finally:
+        executor.shutdown()
 
+    # Archives can finish out of order; report them in input order
+    processed_files = [entry[1:] for entry in sorted(processed_files)]
     return success_count, total_original_size, total_new_size, processed_files
\ No newline at end of file
@@ -4,16 +4,56 @@ Consolidates extraction and creation logic.
 """
 
 import os
+import re
+import shutil
+import struct
+import subprocess
 import zipfile
 import tempfile
+import threading
+import zlib
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from functools import lru_cache
 from pathlib import Path
 from typing import ClassVar
 
+from .filesystem_utils import FileSystemUtils
+
+_DIGIT_RUNS = re.compile(r'(\d+)')
+
+
+def _natural_key(rel_path):
+    """Sort key that orders digit runs numerically, so page2 comes before page10.
+
+    re.split with a capturing group alternates text and digits, so two keys
+    always compare str with str and int with int. The raw path breaks ties
+    (p01 vs p1).
+    """
+    parts = _DIGIT_RUNS.split(rel_path)
+    parts[1::2] = [int(run) for run in parts[1::2]]
+    return parts, rel_path
+
+
+@lru_cache(maxsize=None)
+def _rarfile():
+    """Import rarfile on first use; it is optional and only needed for RAR/CBR."""
+    import rarfile
+    return rarfile
+
+
+@lru_cache(maxsize=None)
+def _py7zr():
+    """Import py7zr on first use; it is optional and only needed for 7Z/CB7."""
+    import py7zr
+    return py7zr
+
 
 class ArchiveHandler:
     """Centralized archive handling for comic book formats."""
 
     SUPPORTED_EXTENSIONS: ClassVar[set[str]] = {'.cbz', '.cbr', '.cb7', '.zip', '.rar', '.7z'}
+    # Same suffixes as a tuple, so a lowercased name is matched by one str.endswith() call
+    _SUPPORTED_SUFFIXES: ClassVar[tuple[str, ...]] = tuple(sorted(SUPPORTED_EXTENSIONS))
     
     # Format to extension mapping
     FORMAT_EXTENSIONS: ClassVar[dict[str, str]] = {
@@ -24,11 +64,33 @@ class ArchiveHandler:
         '7z': '.7z',
         'cb7': '.cb7'
     }
+
+    # Entries already entropy-coded by their format: DEFLATE saves well under 1%
+    # on them for a full compression pass, so ZIP/CBZ output stores them as-is
+    STORED_SUFFIXES: ClassVar[tuple[str, ...]] = (
+        '.webp', '.jpg', '.jpeg', '.png', '.gif', '.avif', '.jxl',
+    )
+
+    # Output buffer for ZIP/CBZ creation
+    ZIP_WRITE_BUFFER: ClassVar[int] = 1 << 20
+
+    # Parallel ZIP extraction: thread cap, and the minimum number of file
+    # members each thread must have before it is worth starting
+    EXTRACT_THREADS: ClassVar[int] = min(4, os.cpu_count() or 1)
+    EXTRACT_MIN_MEMBERS_PER_THREAD: ClassVar[int] = 8
+    # Read size when checking the CRC-32 of a member copied in-kernel
+    STORED_CRC_CHUNK: ClassVar[int] = 1 << 20
+
+    # RAR archives with more members than this are extracted by one unrar run
+    RAR_BATCH_MIN_MEMBERS: ClassVar[int] = 8
+
+    # Concurrent directory listings in a recursive find_archives (I/O bound)
+    FIND_THREADS: ClassVar[int] = 8
     
     @classmethod
     def is_supported_archive(cls, file_path):
         """Check if file is a supported archive format."""
-        return Path(file_path).suffix.lower() in cls.SUPPORTED_EXTENSIONS
+        return os.fspath(file_path).lower().endswith(cls._SUPPORTED_SUFFIXES)
     
     @classmethod
     def get_extension_for_format(cls, format_type):
@@ -51,92 +113,222 @@ class ArchiveHandler:
         return tuple(f for f in cls.FORMAT_EXTENSIONS.keys() if f not in ('rar', 'cbr'))
     
     @classmethod
-    def extract_archive(cls, archive_path, extract_dir, logger=None):
-        """Extract archive to directory using appropriate method."""
+    def extract_archive(cls, archive_path, extract_dir, logger=None, members=None):
+        """Extract archive to directory using appropriate method.
+
+        ``members`` optionally limits extraction to those member names (e.g. a
+        cover page); a name missing from the archive raises KeyError.
+        """
         file_ext = Path(archive_path).suffix.lower()
         
         if logger:
             logger.info(f"Extracting {archive_path} to {extract_dir}...")
 
         if file_ext in ('.cbz', '.zip'):
-            cls._extract_zip(archive_path, extract_dir)
+            cls._extract_zip(archive_path, extract_dir, members)
         elif file_ext in ('.cbr', '.rar'):
-            cls._extract_rar(archive_path, extract_dir)
+            cls._extract_rar(archive_path, extract_dir, members)
         elif file_ext in ('.cb7', '.7z'):
-            cls._extract_7z(archive_path, extract_dir)
+            cls._extract_7z(archive_path, extract_dir, members)
         else:
             raise ValueError(f"Unsupported archive format: {file_ext}")
     
     @staticmethod
-    def _extract_zip(archive_path, extract_dir):
-        """Extract ZIP/CBZ archive with path validation."""
-        import shutil
-
-        with zipfile.ZipFile(archive_path, 'r') as z:
-            dest = Path(extract_dir).resolve()
-            for m in z.infolist():
-                name = Path(m.filename)
-                # Disallow absolute paths
-                if name.is_absolute():
-                    raise ValueError(f"Unsafe absolute path in ZIP entry: {m.filename}")
-                target = (dest / name).resolve()
-                # Disallow traversal outside dest
-                if os.path.commonpath([str(dest), str(target)]) != str(dest):
-                    raise ValueError(f"Path traversal detected in ZIP entry: {m.filename}")
+    def _safe_member_path(dest, name, kind):
+        """Return the extraction path for archive member ``name`` under ``dest``.
+
+        ``dest`` must already be a real (symlink-free) absolute path. The check
+        is purely lexical, so it costs no syscalls per member.
+        """
+        if os.path.isabs(name):
+            raise ValueError(f"Unsafe absolute path in {kind} entry: {name}")
+        target = os.path.normpath(os.path.join(dest, name))
+        # Disallow traversal outside dest
+        if target != dest and not target.startswith(dest + os.sep):
+            raise ValueError(f"Path traversal detected in {kind} entry: {name}")
+        return target
+
+    @classmethod
+    def _extract_zip(cls, archive_path, extract_dir, members=None):
+        """Extract ZIP/CBZ archive with path validation.
+
+        Every member is validated and its directory created before anything
+        is written. Files are then extracted on up to EXTRACT_THREADS threads,
+        each with its own ZipFile handle: zlib releases the GIL while
+        inflating, and the central directory lets entries be read in any order.
+        Unencrypted STORED members are copied in-kernel with copy_file_range
+        where available (see _copy_stored_member).
+        """
+        dest = os.path.realpath(extract_dir)
+        with zipfile.ZipFile(archive_path, 'r') as z, open(archive_path, 'rb') as raw:
+            # Keyed by target so a name the archive repeats is written once,
+            # from its last entry - the file extractall() would leave behind -
+            # instead of by two threads at the same time
+            jobs = {}
+            dirs = set()
+            # getinfo is a dict lookup, so a few members cost no directory scan
+            infos = z.infolist() if members is None else [z.getinfo(name) for name in members]
+            for m in infos:
+                target = cls._safe_member_path(dest, m.filename, 'ZIP')
                 if m.is_dir():
-                    target.mkdir(parents=True, exist_ok=True)
+                    dirs.add(target)
                 else:
-                    target.parent.mkdir(parents=True, exist_ok=True)
-                    with z.open(m, 'r') as src, open(target, 'wb') as dst:
-                        shutil.copyfileobj(src, dst)
+                    dirs.add(os.path.dirname(target))
+                    jobs[target] = m
+            for directory in dirs:
+                os.makedirs(directory, exist_ok=True)
+
+            # pread/copy_file_range take explicit offsets, so one raw descriptor
+            # is shared by every thread
+            raw_fd = raw.fileno() if hasattr(os, 'copy_file_range') else None
+
+            def write_member(handle, m, target):
+                if (raw_fd is not None and m.compress_type == zipfile.ZIP_STORED
+                        and not m.flag_bits & 0x1
+                        and cls._copy_stored_member(raw_fd, m, target)):
+                    return
+                with handle.open(m, 'r') as src, open(target, 'wb') as dst:
+                    shutil.copyfileobj(src, dst)
+
+            jobs = [(m, target) for target, m in jobs.items()]
+            workers = min(cls.EXTRACT_THREADS, len(jobs) // cls.EXTRACT_MIN_MEMBERS_PER_THREAD)
+            if workers <= 1:
+                for m, target in jobs:
+                    write_member(z, m, target)
+                return
+
+            local = threading.local()
+            handles = []
+
+            def extract_member(job):
+                handle = getattr(local, 'zipfile', None)
+                if handle is None:
+                    handle = local.zipfile = zipfile.ZipFile(archive_path, 'r')
+                    handles.append(handle)
+                write_member(handle, *job)
+
+            try:
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    # list() re-raises the first member that failed
+                    list(executor.map(extract_member, jobs))
+            finally:
+                for handle in handles:
+                    handle.close()
+
+    @classmethod
+    def _copy_stored_member(cls, raw_fd, member, target):
+        """Copy an uncompressed ZIP member to ``target`` in-kernel.
+
+        The payload starts after the member's local header, whose name and
+        extra field lengths can differ from the central directory's. Returns
+        False, leaving the caller to extract through zipfile, when the header
+        does not look right, the kernel refuses the copy, or the payload's
+        CRC-32 doesn't match the central directory. zipfile then rewrites the
+        target and raises BadZipFile for a corrupt member, as before.
+        """
+        header = os.pread(raw_fd, 30, member.header_offset)
+        if len(header) != 30 or header[:4] != b'PK\x03\x04':
+            return False
+        name_len, extra_len = struct.unpack('<HH', header[26:30])
+        start = offset = member.header_offset + 30 + name_len + extra_len
+        remaining = member.file_size
+        try:
+            with open(target, 'wb') as dst:
+                while remaining > 0:
+                    copied = os.copy_file_range(raw_fd, dst.fileno(), remaining, offset)
+                    if copied == 0:
+                        return False
+                    offset += copied
+                    remaining -= copied
+            # The copy bypassed zipfile's CRC check; the payload was just read,
+            # so re-reading it for the checksum comes from the page cache
+            crc = 0
+            while start < offset:
+                chunk = os.pread(raw_fd, min(cls.STORED_CRC_CHUNK, offset - start), start)
+                if not chunk:
+                    return False
+                crc = zlib.crc32(chunk, crc)
+                start += len(chunk)
+        except OSError:
+            return False
+        return crc == member.CRC
     
-    @staticmethod
-    def _extract_rar(archive_path, extract_dir):
+    @classmethod
+    def _extract_rar(cls, archive_path, extract_dir, members=None):
         """Extract RAR/CBR archive with path validation."""
         try:
-            import rarfile
+            rarfile = _rarfile()
         except ImportError as e:
             raise ImportError("rarfile is required to extract RAR/CBR archives") from e
-        import shutil
 
-        dest = Path(extract_dir).resolve()
+        dest = os.path.realpath(extract_dir)
+        seen_dirs = set()
         with rarfile.RarFile(archive_path) as rf:
-            for m in rf.infolist():
-                name = Path(m.filename)
-                if name.is_absolute():
-                    raise ValueError(f"Unsafe absolute path in RAR entry: {m.filename}")
-                target = (dest / name).resolve()
-                if os.path.commonpath([str(dest), str(target)]) != str(dest):
-                    raise ValueError(f"Path traversal detected in RAR entry: {m.filename}")
-                if m.isdir():
-                    target.mkdir(parents=True, exist_ok=True)
-                else:
-                    target.parent.mkdir(parents=True, exist_ok=True)
+            infos = rf.infolist() if members is None else [rf.getinfo(name) for name in members]
+            targets = [cls._safe_member_path(dest, m.filename, 'RAR') for m in infos]
+
+            # rf.open() starts one unrar process per member (and re-decodes a
+            # solid archive from its start each time); one "unrar x" does it all
+            if (members is None and len(infos) > cls.RAR_BATCH_MIN_MEMBERS
+                    and not any(m.is_symlink() or m.needs_password() for m in infos)
+                    and cls._unrar_extract_all(rarfile, archive_path, dest)):
+                return
+
+            for m, target in zip(infos, targets):
+                directory = target if m.isdir() else os.path.dirname(target)
+                # Most archives are flat: create each directory once, not per page
+                if directory not in seen_dirs:
+                    os.makedirs(directory, exist_ok=True)
+                    seen_dirs.add(directory)
+                if not m.isdir():
                     with rf.open(m) as src, open(target, 'wb') as dst:
                         shutil.copyfileobj(src, dst)
-    
+
     @staticmethod
-    def _extract_7z(archive_path, extract_dir):
+    def _unrar_extract_all(rarfile, archive_path, dest):
+        """Extract a whole RAR archive with a single unrar run.
+
+        Only used once every member name has been validated and none is a
+        symlink, so unrar writes nothing but regular files and directories
+        under ``dest``. Returns False, leaving the caller to extract member
+        by member through rarfile, when unrar is unavailable or fails.
+        """
+        tool = shutil.which(rarfile.UNRAR_TOOL)
+        if tool is None:
+            return False
+        # -o+ overwrite, -p- never prompt for a password, -idq quiet
+        cmd = [tool, 'x', '-o+', '-p-', '-idq', '-y', '--',
+               os.fspath(archive_path), dest + os.sep]
+        try:
+            result = subprocess.run(cmd, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE,
+                                    stderr=subprocess.PIPE, check=False)
+        except OSError:
+            return False
+        return result.returncode == 0
+    
+    @classmethod
+    def _extract_7z(cls, archive_path, extract_dir, members=None):
         """Extract 7Z/CB7 archive with path validation."""
         try:
-            import py7zr
+            py7zr = _py7zr()
         except ImportError as e:
             raise ImportError("py7zr is required to extract 7Z/CB7 archives") from e
 
-        dest = Path(extract_dir).resolve()
+        dest = os.path.realpath(extract_dir)
         with py7zr.SevenZipFile(archive_path, mode='r') as z:
-            members = z.getnames()
+            names = z.getnames()
+            if members is not None:
+                wanted = set(members)
+                missing = wanted.difference(names)
+                if missing:
+                    raise KeyError(f"There is no item named {sorted(missing)[0]!r} in the archive")
+                names = [name for name in names if name in wanted]
             safe = []
-            for name in members:
-                p = Path(name)
-                if p.is_absolute():
-                    raise ValueError(f"Unsafe absolute path in 7z entry: {name}")
-                target = (dest / p).resolve()
-                if os.path.commonpath([str(dest), str(target)]) != str(dest):
-                    raise ValueError(f"Path traversal detected in 7z entry: {name}")
+            for name in names:
+                cls._safe_member_path(dest, name, '7z')
                 safe.append(name)
             if safe:
-                z.extract(targets=safe, path=str(dest))
+                z.extract(targets=safe, path=dest)
     
     @classmethod
     def create_cbz(cls, source_dir, output_file, logger=None, compresslevel=9):
@@ -144,8 +336,13 @@ class ArchiveHandler:
         return cls.create_archive(source_dir, output_file, 'cbz', logger, compresslevel)
     
     @classmethod
-    def create_archive(cls, source_dir, output_file, format_type, logger=None, compresslevel=9):
-        """Create archive from directory in specified format."""
+    def create_archive(cls, source_dir, output_file, format_type, logger=None, compresslevel=9,
+                       sevenzip_method='lzma2'):
+        """Create archive from directory in specified format.
+
+        ``sevenzip_method`` ('lzma2' or 'zstd') selects the 7Z/CB7 compressor;
+        other formats ignore it.
+        """
         fmt = str(format_type).lower()
         if logger:
             logger.info(f"Creating {fmt.upper()} file: {output_file} (compression level: {compresslevel})")
@@ -154,21 +351,24 @@ class ArchiveHandler:
         image_count = 0
         other_count = 0
 
-        # Collect all files and sort them for proper ordering
+        # Collect all files and sort them for proper ordering. Paths are kept as
+        # plain strings: the relative prefix is computed once per directory
         all_files = []
         for root, _, files in os.walk(source_dir):
+            rel_root = os.path.relpath(root, source_dir)
             for file in files:
-                file_path = Path(root) / file
-                all_files.append((file_path, file_path.relative_to(source_dir)))
-                
+                rel_path = file if rel_root == os.curdir else os.path.join(rel_root, file)
+                all_files.append((os.path.join(root, file), rel_path))
+
                 # Count file types
-                if file_path.suffix.lower() == '.webp':
+                if file.lower().endswith('.webp'):
                     image_count += 1
                 else:
                     other_count += 1
         
-        # Sort files - typically comic pages are numbered sequentially
-        all_files.sort(key=lambda x: str(x[1]))
+        # Sort files - comic pages are numbered sequentially, often without
+        # zero padding, so numbers are compared by value
+        all_files.sort(key=lambda x: _natural_key(x[1]))
 
         # Nothing to do if no files
         if not all_files:
@@ -186,18 +386,35 @@ class ArchiveHandler:
         if not creator:
             supported = ', '.join(cls.get_creatable_formats())
             raise ValueError(f"Unsupported output format: {format_type}. Supported formats are: {supported}")
-        creator(output_file, all_files, compresslevel, logger, image_count, other_count)
+        if creator is cls._create_7z_archive:
+            creator(output_file, all_files, compresslevel, logger, image_count, other_count, sevenzip_method)
+        else:
+            creator(output_file, all_files, compresslevel, logger, image_count, other_count)
     
     @staticmethod
     def _create_zip_archive(output_file, all_files, compresslevel, logger, image_count, other_count):
-        """Create ZIP/CBZ archive."""
+        """Create ZIP/CBZ archive.
+
+        Entries in STORED_SUFFIXES (and everything, at compresslevel 0) are
+        written with ZIP_STORED; the rest are DEFLATEd at ``compresslevel``.
+        """
         if not all_files:
             logger.warning(f"No files to archive for {output_file}. Skipping ZIP/CBZ creation.")
             return
-        with zipfile.ZipFile(output_file, 'w', zipfile.ZIP_DEFLATED, compresslevel=compresslevel) as zipf:
+        default_type = zipfile.ZIP_STORED if compresslevel == 0 else zipfile.ZIP_DEFLATED
+        stored_suffixes = ArchiveHandler.STORED_SUFFIXES
+        # zipfile writes each entry in small chunks: a 1 MiB buffer batches them
+        # into fewer write() calls. strict_timestamps=False clamps pre-1980
+        # mtimes instead of failing on them.
+        with open(output_file, 'wb', buffering=ArchiveHandler.ZIP_WRITE_BUFFER) as fh, \
+                zipfile.ZipFile(fh, 'w', default_type, compresslevel=compresslevel,
+                                strict_timestamps=False) as zipf:
             file_count = 0
             for file_path, rel_path in all_files:
-                zipf.write(file_path, rel_path)
+                if rel_path.lower().endswith(stored_suffixes):
+                    zipf.write(file_path, rel_path, compress_type=zipfile.ZIP_STORED)
+                else:
+                    zipf.write(file_path, rel_path)
                 file_count += 1
 
             if logger:
@@ -219,12 +436,21 @@ class ArchiveHandler:
         raise NotImplementedError(msg)
     
     @staticmethod
-    def _create_7z_archive(output_file, all_files, compresslevel, logger, image_count, other_count):
-        """Create 7Z/CB7 archive."""
+    def _create_7z_archive(output_file, all_files, compresslevel, logger, image_count, other_count,
+                           method='lzma2'):
+        """Create 7Z/CB7 archive.
+
+        ``method='zstd'`` is several times faster to write than LZMA2, but only
+        7-Zip builds with Zstandard support (and py7zr) can open the result.
+        """
         try:
-            import py7zr
-            # Map compresslevel (0-9) to py7zr preset levels
-            filters = [{'id': py7zr.FILTER_LZMA2, 'preset': min(9, max(0, compresslevel))}]
+            py7zr = _py7zr()
+            if method == 'zstd':
+                # Map compresslevel (0-9) onto zstd levels 1-18
+                filters = [{'id': py7zr.FILTER_ZSTD, 'level': min(18, max(1, compresslevel * 2))}]
+            else:
+                # Map compresslevel (0-9) to py7zr preset levels
+                filters = [{'id': py7zr.FILTER_LZMA2, 'preset': min(9, max(0, compresslevel))}]
             with py7zr.SevenZipFile(output_file, 'w', filters=filters) as archive:
                 file_count = 0
                 for file_path, rel_path in all_files:
@@ -245,29 +471,66 @@ class ArchiveHandler:
         """Find all supported archives in directory."""
         archives = []
 
+        # Match on the bare name and only build a Path for archives
         if recursive:
-            for root, _, files in os.walk(directory):
-                for file in files:
-                    file_path = Path(root) / file
-                    if cls.is_supported_archive(file_path):
-                        archives.append(file_path)
+            # Directories are listed concurrently: on network shares each
+            # scandir is a round trip, so a serial walk is latency-bound
+            with ThreadPoolExecutor(max_workers=cls.FIND_THREADS) as executor:
+                pending = {executor.submit(cls._scan_for_archives, os.fspath(directory))}
+                while pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        subdirs, found = future.result()
+                        archives.extend(found)
+                        pending.update(executor.submit(cls._scan_for_archives, d) for d in subdirs)
         else:
-            for file in os.listdir(directory):
-                file_path = Path(directory) / file
-                if file_path.is_file() and cls.is_supported_archive(file_path):
-                    archives.append(file_path)
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if cls.is_supported_archive(entry.name) and entry.is_file():
+                        archives.append(Path(directory, entry.name))
 
         return sorted(archives)
+
+    @classmethod
+    def _scan_for_archives(cls, directory):
+        """List one directory for find_archives: (subdirs to descend, archive Paths).
+
+        Mirrors os.walk's defaults: symlinked directories are not followed
+        and unreadable directories are skipped.
+        """
+        subdirs = []
+        found = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    if is_dir:
+                        if not entry.is_symlink():
+                            subdirs.append(entry.path)
+                    elif cls.is_supported_archive(entry.name):
+                        found.append(Path(entry.path))
+        except OSError:
+            pass
+        return subdirs, found
     
     @classmethod
-    def extract_with_temp_dir(cls, archive_path, logger=None):
-        """Extract archive to temporary directory. Returns temp directory path."""
-        temp_dir = tempfile.mkdtemp()
+    def extract_with_temp_dir(cls, archive_path, logger=None, base_dir=None):
+        """Extract archive to temporary directory. Returns temp directory path.
+
+        The directory is created in ``base_dir`` when given, so callers can keep
+        it on the same filesystem as their output; otherwise in the scratch
+        location chosen by FileSystemUtils.scratch_dir (tmpfs when it has room).
+        """
+        if base_dir is None:
+            base_dir = FileSystemUtils.scratch_dir(os.path.getsize(archive_path))
+        temp_dir = tempfile.mkdtemp(prefix='cbxtools_', dir=base_dir)
         try:
             cls.extract_archive(archive_path, temp_dir, logger)
         except Exception:
             # Clean up on failure
-            import shutil
             shutil.rmtree(temp_dir, ignore_errors=True)
             raise
         else:
@@ -5,9 +5,14 @@ Handles all file types (archives, images, image folders) with a single interface
 Eliminates duplication between regular processing and watch mode.
 """
 
+import multiprocessing
+import os
 import shutil
+import stat
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, Tuple, Any
+from typing import Iterable, List, Optional, Tuple, Any
 
 from .archive_handler import ArchiveHandler
 from .image_analyzer import ImageAnalyzer
@@ -30,6 +35,45 @@ class FileProcessor:
         """
         self.logger = logger
         self.packaging_queue = packaging_queue
+        # Conversion pool kept across items, with the options it was built for
+        self._executor = None
+        self._executor_key = None
+        self._executor_lock = threading.Lock()
+        # Shared by items converting at once, so a memory-capped one runs alone
+        from ..conversion import ConversionGate
+        self._conversion_gate = ConversionGate()
+
+    def _conversion_pool(self, args: Any):
+        """
+        Return the conversion pool for these args, starting it on first use.
+
+        Items are converted one after another but through the same worker
+        pool, so a watch session or batch pays for worker startup once rather
+        than per archive/folder. Packaging (and the cleanup that follows it)
+        already runs behind conversion when a packaging_queue is set.
+        """
+        from ..conversion import conversion_options_from_args, make_conversion_pool
+        num_threads = getattr(args, 'threads', 0) or multiprocessing.cpu_count()
+        use_threads = getattr(args, 'thread_pool', False)
+        options = conversion_options_from_args(args)
+        key = (num_threads, use_threads, options)
+        with self._executor_lock:
+            if self._executor is None or self._executor_key != key:
+                self._shutdown_pool()
+                self._executor = make_conversion_pool(num_threads, options, use_threads)
+                self._executor_key = key
+            return self._executor
+
+    def close(self) -> None:
+        """Shut down the conversion pool, if one was started."""
+        with self._executor_lock:
+            self._shutdown_pool()
+
+    def _shutdown_pool(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+            self._executor_key = None
     
     def process_item(self, item: Path, output_dir: Path, args: Any, 
                     preserve_directory_structure: bool = False, 
@@ -48,21 +92,25 @@ class FileProcessor:
             Tuple of (success, original_size, new_size)
         """
         try:
+            # One stat answers both "file?" and "dir?" and carries the size along
+            try:
+                item_stat = os.stat(item)
+            except FileNotFoundError:
+                self.logger.warning(f"Skipping missing item: {item}")
+                return False, 0, 0
+            mode = item_stat.st_mode
+
             # Determine the target output directory
-            if preserve_directory_structure and input_base_dir and item.parent != input_base_dir:
-                rel_path = item.parent.relative_to(input_base_dir)
-                target_output_dir = output_dir / rel_path
-            else:
-                target_output_dir = output_dir
-            
+            target_output_dir = self._target_output_dir(item, output_dir, preserve_directory_structure,
+                                                        input_base_dir)
             target_output_dir.mkdir(parents=True, exist_ok=True)
             
             # Process based on item type
-            if item.is_file() and ArchiveHandler.is_supported_archive(item):
+            if stat.S_ISREG(mode) and ArchiveHandler.is_supported_archive(item):
                 return self._process_archive_file(item, target_output_dir, args)
-            elif item.is_file() and ImageAnalyzer.is_image_file(item):
-                return self._process_single_image(item, target_output_dir, args)
-            elif item.is_dir() and self._is_image_folder(item):
+            elif stat.S_ISREG(mode) and ImageAnalyzer.is_image_file(item):
+                return self._process_single_image(item, target_output_dir, args, item_stat.st_size)
+            elif stat.S_ISDIR(mode) and self._is_image_folder(item):
                 return self._process_image_folder(item, target_output_dir, args)
             else:
                 self.logger.warning(f"Skipping unsupported item: {item}")
@@ -72,6 +120,63 @@ class FileProcessor:
             self.logger.exception(f"Error processing {item}")
             return False, 0, 0
     
+    def process_items_batch(self, items: Iterable[Path], output_dir: Path, args: Any,
+                            preserve_directory_structure: bool = False,
+                            input_base_dir: Optional[Path] = None,
+                            max_workers: Optional[int] = None) -> List[Tuple[bool, int, int]]:
+        """
+        Process several items concurrently, returning process_item's result
+        for each, in the order the items were given.
+        
+        Items run on a small thread pool so one item's extraction and
+        packaging overlap another's encoding. Encoding itself still goes
+        through the single shared conversion pool, so CPU use stays bounded
+        by --threads. max_workers defaults to half the CPUs: a few items in
+        flight beat more threads per item, because decoders serialize on
+        internal locks.
+        
+        Items that write to the same place (x.jpg and x.png both produce
+        x.webp; a.cbz and a.cbr share the a/ working folder) are grouped by
+        target directory and output name, and each group runs one item at a
+        time. An item whose pages need a memory-capped pool converts alone
+        (see ConversionGate).
+        """
+        items = list(items)
+        groups = {}
+        for index, item in enumerate(items):
+            target = self._target_output_dir(item, output_dir, preserve_directory_structure, input_base_dir)
+            # Image folders write <name>/ and <name>.cbz; files write <stem>.*
+            name = item.name if item.is_dir() else item.stem
+            groups.setdefault((target, name.casefold()), []).append(index)
+
+        if max_workers is None:
+            max_workers = max(1, (os.cpu_count() or 1) // 2)
+        max_workers = min(max_workers, len(groups))
+        results = [None] * len(items)
+
+        def run_group(indices):
+            for index in indices:
+                item = items[index]
+                self.logger.info(f"Processing: {item}")
+                results[index] = self.process_item(item, output_dir, args, preserve_directory_structure,
+                                                   input_base_dir)
+
+        if max_workers <= 1:
+            for indices in groups.values():
+                run_group(indices)
+        else:
+            with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='cbx-item') as pool:
+                list(pool.map(run_group, groups.values()))
+        return results
+
+    @staticmethod
+    def _target_output_dir(item: Path, output_dir: Path, preserve_directory_structure: bool,
+                           input_base_dir: Optional[Path]) -> Path:
+        """Directory an item's output goes to (mirrors the input tree when preserving structure)."""
+        if preserve_directory_structure and input_base_dir and item.parent != input_base_dir:
+            return output_dir / item.parent.relative_to(input_base_dir)
+        return output_dir
+    
     def _process_archive_file(self, archive_file: Path, output_dir: Path, args: Any) -> Tuple[bool, int, int]:
         """Process a single archive file."""
         from ..conversion import process_single_file
@@ -102,34 +207,35 @@ class FileProcessor:
             auto_greyscale_percent_threshold=args.auto_greyscale_percent_threshold,
             preserve_auto_greyscale_png=args.preserve_auto_greyscale_png,
             output_format=str(output_format).lower(),
-            verbose=args.verbose
+            sevenzip_method=getattr(args, 'sevenzip_method', 'lzma2'),
+            verbose=args.verbose,
+            fast_resize=getattr(args, 'fast_resize', False),
+            webp_method_large=getattr(args, 'webp_method_large', None),
+            webp_method_small=getattr(args, 'webp_method_small', None),
+            use_threads=getattr(args, 'thread_pool', False),
+            resize_filter=getattr(args, 'resize_filter', 'lanczos'),
+            executor=self._conversion_pool(args),
+            conversion_gate=self._conversion_gate
         )
     
-    def _process_single_image(self, image_file: Path, output_dir: Path, args: Any) -> Tuple[bool, int, int]:
-        """Process a single image file."""
-        from ..conversion import convert_single_image
+    def _process_single_image(self, image_file: Path, output_dir: Path, args: Any,
+                              orig_size_bytes: Optional[int] = None) -> Tuple[bool, int, int]:
+        """Process a single image file (orig_size_bytes, if known, saves a stat)."""
+        from ..conversion import convert_single_image, conversion_options_from_args
         try:
             # Get original file size
-            _orig_size_str, orig_size_bytes = FileSystemUtils.get_file_size_formatted(image_file)
+            if orig_size_bytes is None:
+                orig_size_bytes = image_file.stat().st_size
             
-            # Convert the image
-            convert_single_image(
-                image_file=image_file,
-                output_dir=output_dir,
-                quality=args.quality,
-                max_width=args.max_width,
-                max_height=args.max_height,
-                grayscale=args.grayscale,
-                auto_contrast=args.auto_contrast,
-                auto_greyscale=args.auto_greyscale,
-                auto_greyscale_pixel_threshold=args.auto_greyscale_pixel_threshold,
-                auto_greyscale_percent_threshold=args.auto_greyscale_percent_threshold,
-                preserve_auto_greyscale_png=args.preserve_auto_greyscale_png,
-                verbose=args.verbose,
-            )
+            # Convert the image (one image: no pool round trip)
+            output_file = output_dir / f"{image_file.stem}.webp"
+            options = conversion_options_from_args(args)
+            _, _, converted, error, _, _, _ = convert_single_image((image_file, output_file, options))
+            if not converted:
+                self.logger.error(f"Error converting {image_file}: {error}")
+                return False, orig_size_bytes, 0
             
             # Calculate new size
-            output_file = output_dir / f"{image_file.stem}.webp"
             if output_file.exists():
                 _new_size_str, new_size_bytes = FileSystemUtils.get_file_size_formatted(output_file)
                 self.logger.info(f"Converted single image: {image_file.name}")
@@ -147,14 +253,14 @@ class FileProcessor:
         from ..conversion import convert_to_webp
         try:
             # Get original size
-            orig_size = sum(f.stat().st_size for f in image_dir.rglob('*') if f.is_file())
+            orig_size = FileSystemUtils.get_directory_size(image_dir)
             
             # Create file-specific output directory
             file_output_dir = output_dir / image_dir.name
             
             # Convert images in the folder
             convert_to_webp(
-                source_dir=image_dir,
+                extract_dir=image_dir,
                 output_dir=file_output_dir,
                 quality=args.quality,
                 max_width=args.max_width,
@@ -171,6 +277,13 @@ class FileProcessor:
                 auto_greyscale_percent_threshold=args.auto_greyscale_percent_threshold,
                 preserve_auto_greyscale_png=args.preserve_auto_greyscale_png,
                 verbose=args.verbose,
+                fast_resize=getattr(args, 'fast_resize', False),
+                webp_method_large=getattr(args, 'webp_method_large', None),
+                webp_method_small=getattr(args, 'webp_method_small', None),
+                use_threads=getattr(args, 'thread_pool', False),
+                resize_filter=getattr(args, 'resize_filter', 'lanczos'),
+                executor=self._conversion_pool(args),
+                conversion_gate=self._conversion_gate,
             )
             
             # Create archive if requested
@@ -187,19 +300,21 @@ class FileProcessor:
                 if self.packaging_queue is not None:
                     result_dict = {"success": False, "new_size": 0}
                     self.packaging_queue.put((file_output_dir, archive_output, image_dir, result_dict,
-                                              output_format, args.zip_compression))
+                                              output_format, args.zip_compression,
+                                              getattr(args, 'sevenzip_method', 'lzma2')))
                     self.logger.info(f"Queued {image_dir.name} for packaging")
                     return True, orig_size, 0
                 else:
                     from ..archives import create_archive
-                    create_archive(file_output_dir, archive_output, output_format, self.logger, args.zip_compression)
+                    create_archive(file_output_dir, archive_output, output_format, self.logger, args.zip_compression,
+                                   getattr(args, 'sevenzip_method', 'lzma2'))
                     new_size = archive_output.stat().st_size
                     if not args.keep_originals:
-                        shutil.rmtree(file_output_dir)
+                        FileSystemUtils.fast_rmtree(file_output_dir)
                     self.logger.info(f"Converted folder: {image_dir.name}")
                     return True, orig_size, new_size
             else:
-                new_size = sum(f.stat().st_size for f in file_output_dir.rglob('*') if f.is_file())
+                new_size = FileSystemUtils.get_directory_size(file_output_dir)
                 self.logger.info(f"Converted folder: {image_dir.name}")
                 return True, orig_size, new_size
                 
@@ -212,12 +327,11 @@ class FileProcessor:
         if not directory.is_dir():
             return False
         
-        # Check if directory contains image files
-        for file_path in directory.iterdir():
-            if file_path.is_file() and ImageAnalyzer.is_image_file(file_path):
-                return True
-        
-        return False
+        # Check if directory contains image files; the name test runs first so
+        # only candidate images need DirEntry.is_file()
+        with os.scandir(directory) as entries:
+            return any(ImageAnalyzer.is_image_file(entry.name) and entry.is_file()
+                       for entry in entries)
     
     def cleanup_after_processing(self, item: Path, success: bool, args: Any, 
                                input_base_dir: Optional[Path] = None) -> None:
@@ -273,19 +387,21 @@ def find_processable_items(directory: Path, recursive: bool = False) -> list[Pat
     
     # Find individual images in the root directory
     if directory.is_dir():
-        direct_images = [f for f in directory.iterdir() 
-                        if f.is_file() and ImageAnalyzer.is_image_file(f)]
-        items.extend(direct_images)
+        with os.scandir(directory) as entries:
+            items.extend(Path(entry.path) for entry in entries
+                         if ImageAnalyzer.is_image_file(entry.name) and entry.is_file())
     
-    # Find image folders
+    # Find image folders. os.walk lists each directory once (via scandir) and
+    # already separates files from subdirectories, so names are all we need
     if recursive:
-        for subdir in directory.rglob('*'):
-            if subdir.is_dir() and subdir != directory:
-                # Check if this directory contains images
-                files = [f for f in subdir.iterdir() if f.is_file()]
-                has_images = any(ImageAnalyzer.is_image_file(f) for f in files)
-                has_archives = any(ArchiveHandler.is_supported_archive(f) for f in files)
-                if has_images and not has_archives:
-                    items.append(subdir)
+        for root, _, files in os.walk(directory):
+            if root == os.fspath(directory):
+                continue
+            # Check if this directory contains images
+            has_images = any(ImageAnalyzer.is_image_file(f) for f in files)
+            has_archives = any(ArchiveHandler.is_supported_archive(f) for f in files)
+            if has_images and not has_archives:
+                items.append(Path(root))
     
-    return sorted(items)
+    # Compare the path strings directly rather than through Path.__lt__
+    return sorted(items, key=os.fspath)
@@ -9,14 +9,44 @@ try:
 except ImportError:
     np = None
     _HAS_NUMPY = False
-from PIL import Image
+from PIL import Image, ImageOps
 from pathlib import Path
+from typing import ClassVar
+import math
 import os
 
 
 class ImageAnalyzer:
     """Centralized image analysis for auto-greyscale detection."""
+
+    IMAGE_EXTENSIONS: ClassVar[frozenset[str]] = frozenset(
+        {'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.tif', '.webp', '.tga', '.ico'}
+    )
+
+    # should_convert_to_greyscale first probes every SAMPLE_STRIDE-th row and
+    # column (~1.5% of the pixels) and only scans the full image when the
+    # sample's colored ratio falls between these multiples of percent_threshold
+    SAMPLE_STRIDE: ClassVar[int] = 8
+    SAMPLE_GREY_FACTOR: ClassVar[float] = 0.25
+    SAMPLE_COLOR_FACTOR: ClassVar[float] = 4.0
+    # Images with fewer sampled pixels than this are always scanned in full
+    SAMPLE_MIN_PIXELS: ClassVar[int] = 4096
+    # The full scan counts colored pixels this many rows at a time and stops
+    # once the running count alone puts the page over percent_threshold
+    SCAN_BLOCK_ROWS: ClassVar[int] = 128
     
+    @staticmethod
+    def _channel_spread(img_array):
+        """Per-pixel max(R,G,B) - min(R,G,B) as a uint8 HxW array (alpha ignored).
+
+        Reduces across the three channel planes with elementwise maximum/minimum
+        rather than .max(axis=2), which walks the interleaved pixels one at a
+        time, and stays in uint8: the spread of uint8 values always fits.
+        """
+        r, g, b = img_array[:, :, 0], img_array[:, :, 1], img_array[:, :, 2]
+        spread = np.maximum(np.maximum(r, g), b)
+        return np.subtract(spread, np.minimum(np.minimum(r, g), b), out=spread)
+
     @staticmethod
     def analyze_colorfulness(img_array, pixel_threshold=16):
         """
@@ -32,16 +62,19 @@ class ImageAnalyzer:
         if not _HAS_NUMPY:
             raise RuntimeError("analyze_colorfulness requires numpy; please install numpy or use fallback")
         # Calculate per-pixel difference between max and min RGB values (ignore alpha if present)
-        arr = img_array
-        if arr.ndim == 3 and arr.shape[2] > 3:
-            arr = arr[:, :, :3]
-        diffs = arr.max(axis=2).astype(int) - arr.min(axis=2).astype(int)
+        diffs = ImageAnalyzer._channel_spread(img_array)
+        return ImageAnalyzer._spread_stats(diffs, pixel_threshold)
+
+    @staticmethod
+    def _spread_stats(diffs, pixel_threshold):
+        """(max_diff, mean_diff, colored_ratio) of a _channel_spread array."""
         max_diff = int(diffs.max())
-        mean_diff = float(diffs.mean())
-        colored_pixels = int(np.count_nonzero(diffs > pixel_threshold))
         total_pixels = diffs.size
+        # An integer sum is exact and avoids mean()'s float64 pass
+        mean_diff = float(diffs.sum(dtype=np.uint64)) / total_pixels
+        colored_pixels = int(np.count_nonzero(diffs > pixel_threshold))
         colored_ratio = colored_pixels / total_pixels
-        
+
         return max_diff, mean_diff, colored_ratio
     
     @classmethod
@@ -56,21 +89,27 @@ class ImageAnalyzer:
         Returns:
             dict: Extended debug information including all statistics
         """
-        # Get core analysis
-        max_diff, mean_diff, colored_ratio = cls.analyze_colorfulness(img_array, pixel_threshold)
-        
-        # Add extended debug statistics
-        diffs = img_array.max(axis=2).astype(int) - img_array.min(axis=2).astype(int)
-        std_diff = float(diffs.std())
-        median_diff = float(np.median(diffs))
-        percentile_95 = float(np.percentile(diffs, 95))
-        percentile_99 = float(np.percentile(diffs, 99))
+        if not _HAS_NUMPY:
+            raise RuntimeError("analyze_colorfulness requires numpy; please install numpy or use fallback")
+        # Get core analysis from the same spread array the extended statistics use
+        diffs = cls._channel_spread(img_array)
+        max_diff, mean_diff, colored_ratio = cls._spread_stats(diffs, pixel_threshold)
         
-        # Count pixels in different ranges
-        colored_pixels = int(np.count_nonzero(diffs > pixel_threshold))
-        very_colored = int(np.count_nonzero(diffs > pixel_threshold * 2))
-        slightly_colored = int(np.count_nonzero((diffs > pixel_threshold) & (diffs <= pixel_threshold * 2)))
+        # Add extended debug statistics. The spreads are uint8, so one 256-bin
+        # histogram pass yields every statistic and count below
+        hist = np.bincount(diffs.ravel(), minlength=256)
         total_pixels = diffs.size
+        values = np.arange(256, dtype=np.float64)
+        std_diff = float(np.sqrt(np.dot(hist, (values - mean_diff) ** 2) / total_pixels))
+        cumulative = np.cumsum(hist)
+        median_diff = cls._histogram_percentile(cumulative, 50)
+        percentile_95 = cls._histogram_percentile(cumulative, 95)
+        percentile_99 = cls._histogram_percentile(cumulative, 99)
+        
+        # Count pixels in different ranges (diffs > t  <=>  bin >= floor(t) + 1)
+        colored_pixels = int(hist[max(0, math.floor(pixel_threshold) + 1):].sum())
+        very_colored = int(hist[max(0, math.floor(pixel_threshold * 2) + 1):].sum())
+        slightly_colored = colored_pixels - very_colored
         
         return {
             'max_diff': max_diff,
@@ -90,6 +129,16 @@ class ImageAnalyzer:
             'image_shape': img_array.shape
         }
     
+    @staticmethod
+    def _histogram_percentile(cumulative, q):
+        """np.percentile(data, q) (linear interpolation) from data's cumulative histogram."""
+        position = (cumulative[-1] - 1) * q / 100.0
+        lower = math.floor(position)
+        # The k-th smallest value (0-based) is the first bin whose cumulative count exceeds k
+        lower_value = int(np.searchsorted(cumulative, lower, side='right'))
+        upper_value = int(np.searchsorted(cumulative, min(lower + 1, cumulative[-1] - 1), side='right'))
+        return lower_value + (position - lower) * (upper_value - lower_value)
+
     @classmethod
     def should_convert_to_greyscale(cls, img_array, pixel_threshold=16, percent_threshold=0.01):
         """
@@ -103,11 +152,25 @@ class ImageAnalyzer:
         Returns:
             bool: True if image should be converted to greyscale
         """
-        _, _, colored_ratio = cls.analyze_colorfulness(img_array, pixel_threshold)
+        if not _HAS_NUMPY:
+            raise RuntimeError("should_convert_to_greyscale requires numpy; please install numpy or use fallback")
+        sample = img_array[::cls.SAMPLE_STRIDE, ::cls.SAMPLE_STRIDE]
+        if sample.shape[0] * sample.shape[1] >= cls.SAMPLE_MIN_PIXELS:
+            _, _, sample_ratio = cls.analyze_colorfulness(sample, pixel_threshold)
+            if sample_ratio > percent_threshold * cls.SAMPLE_COLOR_FACTOR:
+                return False  # Clearly colourful
+            if 0.0 < sample_ratio < percent_threshold * cls.SAMPLE_GREY_FACTOR:
+                return True  # Clearly near-greyscale (a zero sample still needs the full scan)
+        # Full scan in row blocks, stopping as soon as the page is over threshold
+        total_pixels = img_array.shape[0] * img_array.shape[1]
+        colored_pixels = 0
+        for start in range(0, img_array.shape[0], cls.SCAN_BLOCK_ROWS):
+            block = cls._channel_spread(img_array[start:start + cls.SCAN_BLOCK_ROWS])
+            colored_pixels += int(np.count_nonzero(block > pixel_threshold))
+            if colored_pixels / total_pixels > percent_threshold:
+                return False
         # Don't convert if there are no colored pixels (already effectively greyscale)
-        if colored_ratio == 0.0:
-            return False
-        return colored_ratio <= percent_threshold
+        return colored_pixels > 0
     
     @classmethod
     def should_convert_to_greyscale_detailed(cls, img_array, pixel_threshold=16, percent_threshold=0.01):
@@ -138,11 +201,14 @@ class ImageAnalyzer:
     @staticmethod
     def convert_to_bw_with_contrast(img):
         """Convert image to black and white with auto contrast enhancement."""
-        from PIL import ImageOps
-        
         # First convert to black and white (grayscale)
         bw_img = img.convert('L')
-        
+
+        # A page that already spans 0..255 would get an identity LUT; getextrema
+        # stops scanning as soon as it has seen both, so this check is nearly free
+        if bw_img.getextrema() == (0, 255):
+            return bw_img
+
         # Then apply auto contrast to the black and white image
         enhanced_bw_img = ImageOps.autocontrast(bw_img)
         
@@ -151,27 +217,25 @@ class ImageAnalyzer:
     @staticmethod
     def is_image_file(file_path):
         """Check if a file is an image based on its extension."""
-        image_extensions = {'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.webp', '.tga', '.ico'}
-        return Path(file_path).suffix.lower() in image_extensions
+        # splitext, like Path.suffix, gives a bare dotfile (".jpg") no extension
+        return os.path.splitext(os.fspath(file_path))[1].lower() in ImageAnalyzer.IMAGE_EXTENSIONS
     
     @classmethod
     def find_image_files(cls, directory, recursive=False):
         """Find all image files in the given directory."""
-        from pathlib import Path
-        import os
-        
         images = []
 
+        # Match on the bare name before building a Path for it
         if recursive:
             for root, _, files in os.walk(directory):
                 for file in files:
-                    file_path = Path(root) / file
-                    if cls.is_image_file(file_path):
-                        images.append(file_path)
+                    if cls.is_image_file(file):
+                        images.append(Path(root) / file)
         else:
             for file in os.listdir(directory):
-                file_path = Path(directory) / file
-                if file_path.is_file() and cls.is_image_file(file_path):
-                    images.append(file_path)
+                if cls.is_image_file(file):
+                    file_path = Path(directory) / file
+                    if file_path.is_file():
+                        images.append(file_path)
 
         return sorted(images)
@@ -6,7 +6,6 @@ Consolidates packaging logic for different execution contexts.
 
 import queue
 import threading
-import shutil
 from pathlib import Path
 
 from .archive_handler import ArchiveHandler
@@ -21,14 +20,16 @@ class PackagingWorkerBase:
         self.keep_originals = keep_originals
         self.running = False
     
-    def package_single(self, file_output_dir, archive_output, input_file, format_type='cbz', zip_compresslevel=9):
+    def package_single(self, file_output_dir, archive_output, input_file, format_type='cbz', zip_compresslevel=9,
+                       sevenzip_method='lzma2'):
         """Package a single directory into specified archive format."""
         try:
-            ArchiveHandler.create_archive(file_output_dir, archive_output, format_type, self.logger, zip_compresslevel)
+            ArchiveHandler.create_archive(file_output_dir, archive_output, format_type, self.logger, zip_compresslevel,
+                                          sevenzip_method)
             _, new_size_bytes = FileSystemUtils.get_file_size_formatted(archive_output)
             
             if not self.keep_originals:
-                shutil.rmtree(file_output_dir)
+                FileSystemUtils.fast_rmtree(file_output_dir)
                 self.logger.debug(f"Removed extracted files from {file_output_dir}")
             
             self.logger.info(f"Packaged {input_file.name} successfully")
@@ -42,9 +43,11 @@ class PackagingWorkerBase:
 class SynchronousPackagingWorker(PackagingWorkerBase):
     """Synchronous packaging worker for single-threaded operations."""
     
-    def process(self, file_output_dir, archive_output, input_file, format_type='cbz', zip_compresslevel=9):
+    def process(self, file_output_dir, archive_output, input_file, format_type='cbz', zip_compresslevel=9,
+                sevenzip_method='lzma2'):
         """Process packaging synchronously."""
-        return self.package_single(file_output_dir, archive_output, input_file, format_type, zip_compresslevel)
+        return self.package_single(file_output_dir, archive_output, input_file, format_type, zip_compresslevel,
+                                   sevenzip_method)
 
 
 class AsynchronousPackagingWorker(PackagingWorkerBase):
@@ -77,12 +80,14 @@ class AsynchronousPackagingWorker(PackagingWorkerBase):
         if self.worker_thread:
             self.worker_thread.join(timeout=10)
     
-    def queue_package(self, file_output_dir, archive_output, input_file, result_dict, format_type='cbz', zip_compresslevel=9):
+    def queue_package(self, file_output_dir, archive_output, input_file, result_dict, format_type='cbz', zip_compresslevel=9,
+                      sevenzip_method='lzma2'):
         """Queue a packaging operation."""
         if not self.running:
             self.start()
         
-        self.packaging_queue.put((file_output_dir, archive_output, input_file, result_dict, format_type, zip_compresslevel))
+        self.packaging_queue.put((file_output_dir, archive_output, input_file, result_dict, format_type, zip_compresslevel,
+                                  sevenzip_method))
     
     def _worker_loop(self):
         """Main worker loop for processing packaging queue."""
@@ -93,7 +98,10 @@ class AsynchronousPackagingWorker(PackagingWorkerBase):
                 break
             
             # Handle both old and new queue item formats
-            if len(item) >= 6:
+            sevenzip_method = 'lzma2'  # Default
+            if len(item) >= 7:
+                file_output_dir, archive_output, input_file, result_dict, format_type, zip_compresslevel, sevenzip_method = item
+            elif len(item) >= 6:
                 file_output_dir, archive_output, input_file, result_dict, format_type, zip_compresslevel = item
             elif len(item) >= 5:
                 file_output_dir, archive_output, input_file, result_dict, zip_compresslevel = item
@@ -104,7 +112,7 @@ class AsynchronousPackagingWorker(PackagingWorkerBase):
                 zip_compresslevel = 9  # Default
             
             success, new_size = self.package_single(
-                file_output_dir, archive_output, input_file, format_type, zip_compresslevel
+                file_output_dir, archive_output, input_file, format_type, zip_compresslevel, sevenzip_method
             )
             
             result_dict["success"] = success
@@ -16,6 +16,11 @@ from .core.image_analyzer import ImageAnalyzer
 from .core.archive_handler import ArchiveHandler
 
 
+# Lowercase suffixes the debug tools analyse
+DEBUG_IMAGE_EXTS = ('.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.tif', '.webp')
+DEBUG_ARCHIVE_EXTS = ('.cbz', '.cbr', '.zip', '.rar')
+
+
 # Re-export for backward compatibility with debug interface
 def analyze_image_colorfulness_debug(img_array, pixel_threshold=16):
     """Extended debug version that returns additional statistics."""
@@ -201,14 +206,12 @@ def debug_archive_greyscale(archive_path, output_dir=None,
                 return None
             
             # Find all image files
-            image_exts = {'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.webp'}
             image_files = []
             
             for root, _, files in os.walk(temp_path):
                 for file in files:
-                    file_path = Path(root) / file
-                    if file_path.suffix.lower() in image_exts:
-                        image_files.append(file_path)
+                    if file.lower().endswith(DEBUG_IMAGE_EXTS):
+                        image_files.append(Path(root) / file)
             
             image_files.sort()
             
@@ -596,13 +599,8 @@ def analyze_directory_for_auto_greyscale(directory_path, pixel_threshold=16,
         logger = logging.getLogger(__name__)
     
     # Look for both image files and CBZ/CBR archives
-    image_exts = {'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.webp'}
-    archive_exts = {'.cbz', '.cbr', '.zip', '.rar'}
-    
-    files_to_analyze = []
-    for f in directory_path.glob('*'):
-        if f.suffix.lower() in image_exts or f.suffix.lower() in archive_exts:
-            files_to_analyze.append(f)
+    files_to_analyze = [f for f in directory_path.glob('*')
+                        if f.suffix.lower() in DEBUG_IMAGE_EXTS + DEBUG_ARCHIVE_EXTS]
     
     if not files_to_analyze:
         logger.error(f"No image files or CBZ/CBR archives found in {directory_path}")
@@ -626,7 +624,7 @@ def analyze_directory_for_auto_greyscale(directory_path, pixel_threshold=16,
             )
             
             if analysis:
-                if file_to_analyze.suffix.lower() in archive_exts:
+                if file_to_analyze.suffix.lower() in DEBUG_ARCHIVE_EXTS:
                     # Handle archive results
                     archive_summary = analysis.get('summary', {})
                     archive_convert_count = archive_summary.get('convert_count', 0)
@@ -15,10 +15,12 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from .archives import find_comic_archives
 from .core.archive_handler import ArchiveHandler
+from .core.filesystem_utils import FileSystemUtils
 from .core.image_analyzer import ImageAnalyzer
 
 
-IMAGE_EXTS = {'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.webp'}
+# A tuple so a lowercased file name can be matched with one str.endswith() call
+IMAGE_EXTS = ('.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.tif', '.webp')
 
 
 def archive_contains_near_greyscale(archive_path, pixel_threshold=16, percent_threshold=0.01, logger=None):
@@ -31,7 +33,8 @@ def archive_contains_near_greyscale(archive_path, pixel_threshold=16, percent_th
     near_count = 0
     total_count = 0
 
-    with tempfile.TemporaryDirectory() as temp_dir:
+    scratch = FileSystemUtils.scratch_dir(archive_path.stat().st_size)
+    with tempfile.TemporaryDirectory(dir=scratch) as temp_dir:
         temp_path = Path(temp_dir)
         try:
             ArchiveHandler.extract_archive(archive_path, temp_path, logger)
@@ -42,8 +45,8 @@ def archive_contains_near_greyscale(archive_path, pixel_threshold=16, percent_th
 
         for root, _, files in os.walk(temp_path):
             for file in files:
-                img_path = Path(root) / file
-                if img_path.suffix.lower() in IMAGE_EXTS:
+                if file.lower().endswith(IMAGE_EXTS):
+                    img_path = Path(root) / file
                     try:
                         with Image.open(img_path) as img:
                             if img.mode not in ('RGB', 'RGBA'):
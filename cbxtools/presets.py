@@ -246,7 +246,11 @@ def apply_preset_with_overrides(preset_name, overrides, logger=None):
         'auto_contrast': False,
         'auto_greyscale': False,
         'auto_greyscale_pixel_threshold': 16,
-        'auto_greyscale_percent_threshold': 0.01
+        'auto_greyscale_percent_threshold': 0.01,
+        'fast_resize': False,
+        'webp_method_large': None,
+        'webp_method_small': None,
+        'resize_filter': 'lanczos'
     }
     
     for key, value in defaults.items():
@@ -270,7 +274,8 @@ def export_preset_from_args(args):
         'quality', 'max_width', 'max_height', 'method',
         'preprocessing', 'zip_compression', 'lossless',
         'grayscale', 'auto_contrast',
-        'auto_greyscale', 'auto_greyscale_pixel_threshold', 'auto_greyscale_percent_threshold'
+        'auto_greyscale', 'auto_greyscale_pixel_threshold', 'auto_greyscale_percent_threshold',
+        'fast_resize', 'webp_method_large', 'webp_method_small', 'resize_filter'
     ]
     
     for param in possible_params:
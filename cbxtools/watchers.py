@@ -177,7 +177,10 @@ def watch_directory(input_dir, output_dir, args, logger, stats_tracker=None):
                         break
 
                     # Handle both old and new queue item formats
-                    if len(item) >= 6:
+                    sevenzip_method = 'lzma2'  # Default
+                    if len(item) >= 7:
+                        file_output_dir, archive_output, input_file, result_dict, format_type, zip_compresslevel, sevenzip_method = item
+                    elif len(item) >= 6:
                         file_output_dir, archive_output, input_file, result_dict, format_type, zip_compresslevel = item
                     elif len(item) >= 5:
                         file_output_dir, archive_output, input_file, result_dict, zip_compresslevel = item
@@ -188,7 +191,7 @@ def watch_directory(input_dir, output_dir, args, logger, stats_tracker=None):
                         zip_compresslevel = 9  # Default
 
                     success, new_size = worker.package_single(
-                        file_output_dir, archive_output, input_file, format_type, zip_compresslevel
+                        file_output_dir, archive_output, input_file, format_type, zip_compresslevel, sevenzip_method
                     )
 
                     result_dict["success"] = success
@@ -297,17 +300,16 @@ def watch_directory(input_dir, output_dir, args, logger, stats_tracker=None):
             if unprocessed_items:
                 logger.info(f"Found {len(unprocessed_items)} new item(s) to process")
                 
-                for item in unprocessed_items:
-                    logger.info(f"Processing: {item}")
-                    
-                    # Process the item using the unified processor
-                    success, original_size, result = processor.process_item(
-                        item=item,
-                        output_dir=output_dir,
-                        args=args,
-                        preserve_directory_structure=True,
-                        input_base_dir=input_dir
-                    )
+                # Process the items using the unified processor, several at a time
+                batch_results = processor.process_items_batch(
+                    unprocessed_items,
+                    output_dir=output_dir,
+                    args=args,
+                    preserve_directory_structure=True,
+                    input_base_dir=input_dir
+                )
+
+                for item, (success, original_size, result) in zip(unprocessed_items, batch_results):
 
                     if success:
                         # Handle direct result vs async result
@@ -352,6 +354,7 @@ def watch_directory(input_dir, output_dir, args, logger, stats_tracker=None):
         import traceback
         logger.error(traceback.format_exc())
     finally:
+        processor.close()
         # Wait for all pending operations to complete
         if packaging_queue is not None:
             # Add sentinel to stop the packaging thread
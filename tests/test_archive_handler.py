@@ -0,0 +1,286 @@
+import os
+import struct
+import subprocess
+import zipfile
+import zlib
+
+import pytest
+
+from cbxtools.core.archive_handler import ArchiveHandler
+
+
+def test_create_cbz_stores_images_and_deflates_the_rest(tmp_path):
+    source = tmp_path / "src"
+    source.mkdir()
+    (source / "p01.webp").write_bytes(b"RIFF" + b"\x00" * 64)
+    (source / "cover.JPG").write_bytes(b"\xff\xd8" + b"\x00" * 64)
+    (source / "ComicInfo.xml").write_text("<ComicInfo/>" * 20)
+    output = tmp_path / "out.cbz"
+
+    ArchiveHandler.create_archive(source, output, 'cbz', None, 9)
+
+    with zipfile.ZipFile(output) as zf:
+        types = {info.filename: info.compress_type for info in zf.infolist()}
+    assert types == {
+        "ComicInfo.xml": zipfile.ZIP_DEFLATED,
+        "cover.JPG": zipfile.ZIP_STORED,
+        "p01.webp": zipfile.ZIP_STORED,
+    }
+
+
+def test_create_cbz_level_zero_stores_everything(tmp_path):
+    source = tmp_path / "src"
+    source.mkdir()
+    (source / "ComicInfo.xml").write_text("<ComicInfo/>")
+    output = tmp_path / "out.cbz"
+
+    ArchiveHandler.create_archive(source, output, 'cbz', None, 0)
+
+    with zipfile.ZipFile(output) as zf:
+        assert [info.compress_type for info in zf.infolist()] == [zipfile.ZIP_STORED]
+
+
+def test_create_cb7_with_zstd_round_trips(tmp_path):
+    py7zr = pytest.importorskip("py7zr")
+    source = tmp_path / "src"
+    source.mkdir()
+    (source / "p01.webp").write_bytes(b"RIFF" + b"\x00" * 64)
+    output = tmp_path / "out.cb7"
+
+    ArchiveHandler.create_archive(source, output, 'cb7', None, 5, sevenzip_method='zstd')
+
+    with py7zr.SevenZipFile(output, 'r') as archive:
+        assert archive.getnames() == ["p01.webp"]
+    extract_dir = tmp_path / "extracted"
+    ArchiveHandler.extract_archive(output, extract_dir)
+    assert (extract_dir / "p01.webp").read_bytes() == b"RIFF" + b"\x00" * 64
+
+
+def test_extract_zip_rejects_member_outside_destination(tmp_path):
+    archive = tmp_path / "evil.cbz"
+    with zipfile.ZipFile(archive, 'w') as zf:
+        zf.writestr("pages/../p01.webp", b"ok")
+        zf.writestr("../escape.txt", b"bad")
+
+    with pytest.raises(ValueError, match="Path traversal"):
+        ArchiveHandler.extract_archive(archive, tmp_path / "out")
+
+    # Members are validated before any of them is written
+    assert not (tmp_path / "out" / "p01.webp").exists()
+    assert not (tmp_path / "escape.txt").exists()
+
+
+def test_extract_zip_on_several_threads(tmp_path, monkeypatch):
+    monkeypatch.setattr(ArchiveHandler, "EXTRACT_THREADS", 3)
+    archive = tmp_path / "book.cbz"
+    pages = {f"ch{i % 2}/p{i:02d}.webp": bytes([i]) * (1000 + i) for i in range(40)}
+    with zipfile.ZipFile(archive, 'w', zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("ch0/", b"")
+        for name, data in pages.items():
+            zf.writestr(name, data)
+        zf.writestr("pages/../ComicInfo.xml", b"<ComicInfo/>")
+
+    ArchiveHandler.extract_archive(archive, tmp_path / "out")
+
+    for name, data in pages.items():
+        assert (tmp_path / "out" / name).read_bytes() == data
+    assert (tmp_path / "out" / "ComicInfo.xml").read_bytes() == b"<ComicInfo/>"
+
+
+def test_extract_zip_keeps_the_last_of_duplicate_members(tmp_path, monkeypatch):
+    monkeypatch.setattr(ArchiveHandler, "EXTRACT_THREADS", 4)
+    archive = tmp_path / "rescan.cbz"
+    with pytest.warns(UserWarning, match="Duplicate name"):
+        with zipfile.ZipFile(archive, 'w', zipfile.ZIP_STORED) as zf:
+            for i in range(40):
+                zf.writestr(f"p{i:02d}.jpg", bytes([i]) * 3000)
+            for i in range(40):
+                zf.writestr(f"p{i % 4:02d}.jpg", bytes([100 + i]) * (5000 + i))
+    copied = []
+    copy_stored = ArchiveHandler._copy_stored_member
+
+    def counting_copy(raw_fd, member, target):
+        copied.append(target)
+        return copy_stored(raw_fd, member, target)
+
+    monkeypatch.setattr(ArchiveHandler, "_copy_stored_member", counting_copy)
+
+    ArchiveHandler.extract_archive(archive, tmp_path / "out")
+
+    reference = tmp_path / "reference"
+    with zipfile.ZipFile(archive) as zf:
+        zf.extractall(reference)
+    assert sorted(os.listdir(tmp_path / "out")) == sorted(os.listdir(reference))
+    for name in os.listdir(reference):
+        assert (tmp_path / "out" / name).read_bytes() == (reference / name).read_bytes()
+    if hasattr(os, "copy_file_range"):
+        assert len(copied) == len(set(copied)) == 40
+
+
+def test_extract_zip_copies_stored_members_verbatim(tmp_path):
+    archive = tmp_path / "stored.cbz"
+    pages = {f"p{i:02d}.webp": bytes(range(256)) * (i + 1) for i in range(5)}
+    with zipfile.ZipFile(archive, 'w', zipfile.ZIP_STORED) as zf:
+        for name, data in pages.items():
+            info = zipfile.ZipInfo(name)
+            info.extra = b"\xfe\xca\x02\x00ok"  # local header longer than a bare one
+            zf.writestr(info, data)
+        zf.writestr("ComicInfo.xml", b"<ComicInfo/>", compress_type=zipfile.ZIP_DEFLATED)
+
+    ArchiveHandler.extract_archive(archive, tmp_path / "out")
+
+    for name, data in pages.items():
+        assert (tmp_path / "out" / name).read_bytes() == data
+    assert (tmp_path / "out" / "ComicInfo.xml").read_bytes() == b"<ComicInfo/>"
+
+
+def test_extract_zip_rejects_corrupt_stored_member(tmp_path):
+    archive = tmp_path / "corrupt.cbz"
+    payload = b"page-bytes" * 100
+    with zipfile.ZipFile(archive, 'w', zipfile.ZIP_STORED) as zf:
+        zf.writestr("p01.webp", payload)
+    blob = bytearray(archive.read_bytes())
+    blob[blob.index(payload) + 5] ^= 0xFF
+    archive.write_bytes(bytes(blob))
+
+    with pytest.raises(zipfile.BadZipFile):
+        ArchiveHandler.extract_archive(archive, tmp_path / "out")
+
+
+def test_create_cbz_orders_pages_numerically(tmp_path):
+    source = tmp_path / "src"
+    (source / "ch10").mkdir(parents=True)
+    (source / "ch2").mkdir()
+    for name in ("ch10/page1.webp", "ch2/page10.webp", "ch2/page2.webp", "ch2/page01.webp"):
+        (source / name).write_bytes(b"RIFF")
+    output = tmp_path / "out.cbz"
+
+    ArchiveHandler.create_archive(source, output, 'cbz', None, 9)
+
+    with zipfile.ZipFile(output) as zf:
+        assert zf.namelist() == [
+            "ch2/page01.webp", "ch2/page2.webp", "ch2/page10.webp", "ch10/page1.webp",
+        ]
+
+
+@pytest.mark.parametrize("fmt", ["cbz", "cb7"])
+def test_extract_selected_members_only(tmp_path, fmt):
+    if fmt == "cb7":
+        pytest.importorskip("py7zr")
+    source = tmp_path / "src"
+    source.mkdir()
+    for i in range(1, 4):
+        (source / f"p{i}.webp").write_bytes(bytes([i]) * 16)
+    archive = tmp_path / f"book.{fmt}"
+    ArchiveHandler.create_archive(source, archive, fmt, None, 5)
+
+    ArchiveHandler.extract_archive(archive, tmp_path / "out", members=["p1.webp"])
+
+    assert sorted(p.name for p in (tmp_path / "out").iterdir()) == ["p1.webp"]
+    with pytest.raises(KeyError):
+        ArchiveHandler.extract_archive(archive, tmp_path / "out2", members=["missing.webp"])
+
+
+def test_find_archives_recursive_matches_a_walk(tmp_path):
+    for rel in ("a.cbz", "x/b.CBR", "x/y/c.7z", "x/y/z/page.webp", "w/notes.txt"):
+        path = tmp_path / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"")
+
+    found = ArchiveHandler.find_archives(tmp_path, recursive=True)
+
+    assert found == [tmp_path / "a.cbz", tmp_path / "x" / "b.CBR", tmp_path / "x" / "y" / "c.7z"]
+    assert ArchiveHandler.find_archives(tmp_path) == [tmp_path / "a.cbz"]
+
+
+def test_create_cbz_accepts_pre_1980_timestamps(tmp_path):
+    source = tmp_path / "src"
+    source.mkdir()
+    page = source / "p01.webp"
+    page.write_bytes(b"RIFF")
+    os.utime(page, (0, 0))
+    output = tmp_path / "out.cbz"
+
+    ArchiveHandler.create_archive(source, output, 'cbz', None, 9)
+
+    with zipfile.ZipFile(output) as zf:
+        assert zf.read("p01.webp") == b"RIFF"
+        assert zf.getinfo("p01.webp").date_time[0] == 1980
+
+
+def _rar_header(head_type, flags, body, data=b""):
+    header = struct.pack("<BHH", head_type, flags, 7 + len(body)) + body
+    return struct.pack("<H", zlib.crc32(header) & 0xFFFF) + header + data
+
+
+def _make_stored_rar(path, files):
+    """Write a RAR 4 archive of uncompressed members (rarfile reads these without unrar)."""
+    blob = b"Rar!\x1a\x07\x00" + _rar_header(0x73, 0, b"\x00" * 6)
+    for name, data in files:
+        encoded = name.encode()
+        body = struct.pack("<IIBIIBBHI", len(data), len(data), 2, zlib.crc32(data),
+                           0x21, 29, 0x30, len(encoded), 0x20) + encoded
+        blob += _rar_header(0x74, 0x8000, body, data)
+    path.write_bytes(blob + _rar_header(0x7B, 0x4000, b""))
+
+
+@pytest.fixture
+def stored_cbr(tmp_path):
+    pytest.importorskip("rarfile")
+    pages = {f"p{i}.png": bytes([i]) * 32 for i in range(ArchiveHandler.RAR_BATCH_MIN_MEMBERS + 1)}
+    archive = tmp_path / "book.cbr"
+    _make_stored_rar(archive, pages.items())
+    return archive, pages
+
+
+def _fake_unrar(monkeypatch, returncode, write):
+    calls = []
+
+    def run(cmd, **kwargs):
+        calls.append(cmd)
+        dest = cmd[-1]
+        for name, data in write.items():
+            with open(os.path.join(dest, name), "wb") as fh:
+                fh.write(data)
+        return subprocess.CompletedProcess(cmd, returncode, b"", b"")
+
+    monkeypatch.setattr("cbxtools.core.archive_handler.shutil.which", lambda tool: "/usr/bin/unrar")
+    monkeypatch.setattr("cbxtools.core.archive_handler.subprocess.run", run)
+    return calls
+
+
+def test_extract_rar_uses_one_unrar_run_for_many_pages(tmp_path, monkeypatch, stored_cbr):
+    archive, pages = stored_cbr
+    dest = tmp_path / "out"
+    dest.mkdir()
+    calls = _fake_unrar(monkeypatch, 0, pages)
+
+    ArchiveHandler.extract_archive(archive, dest)
+
+    assert calls == [["/usr/bin/unrar", "x", "-o+", "-p-", "-idq", "-y", "--",
+                      str(archive), os.path.realpath(dest) + os.sep]]
+    assert {p.name: p.read_bytes() for p in dest.iterdir()} == pages
+
+
+def test_extract_rar_falls_back_per_member_when_unrar_fails(tmp_path, monkeypatch, stored_cbr):
+    archive, pages = stored_cbr
+    dest = tmp_path / "out"
+    dest.mkdir()
+    # A failed run leaves a truncated page behind; the fallback must overwrite it
+    calls = _fake_unrar(monkeypatch, 3, {"p0.png": b"\x00\x00"})
+
+    ArchiveHandler.extract_archive(archive, dest)
+
+    assert len(calls) == 1
+    assert {p.name: p.read_bytes() for p in dest.iterdir()} == pages
+
+
+def test_extract_rar_without_unrar_on_path_reads_members_directly(tmp_path, monkeypatch, stored_cbr):
+    archive, pages = stored_cbr
+    dest = tmp_path / "out"
+    dest.mkdir()
+    monkeypatch.setattr("cbxtools.core.archive_handler.shutil.which", lambda tool: None)
+
+    ArchiveHandler.extract_archive(archive, dest)
+
+    assert {p.name: p.read_bytes() for p in dest.iterdir()} == pages
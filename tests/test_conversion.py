@@ -0,0 +1,231 @@
+import logging
+import threading
+import time
+import zipfile
+from pathlib import Path
+from types import SimpleNamespace
+
+from PIL import Image
+
+from cbxtools import conversion
+from cbxtools.conversion import (
+    apply_preprocessing,
+    convert_single_image,
+    convert_to_webp,
+    imap_unordered,
+    memory_capped_workers,
+    prefetch_extractions,
+    process_archive_files,
+    select_webp_method,
+    _should_convert_inline,
+)
+
+
+def _make_images(directory, count, size=(64, 48)):
+    paths = []
+    for i in range(count):
+        path = directory / f"page{i:03d}.png"
+        Image.new("RGB", size, (i * 20 % 256, 80, 160)).save(path)
+        paths.append(path)
+    return paths
+
+
+def test_small_batches_convert_inline(tmp_path):
+    paths = _make_images(tmp_path, 5)
+    args = [(p, p.with_suffix(".webp"), {}) for p in paths]
+    assert _should_convert_inline(args[:2], 8)
+    assert _should_convert_inline(args, 1)
+    # A handful of tiny images is still below the byte threshold
+    assert _should_convert_inline(args, 8)
+
+
+def test_convert_to_webp_converts_images_and_copies_metadata(tmp_path):
+    src = tmp_path / "src"
+    (src / "sub").mkdir(parents=True)
+    _make_images(src, 3)
+    _make_images(src / "sub", 1)
+    (src / "ComicInfo.xml").write_text("<ComicInfo/>", encoding="utf-8")
+    out = tmp_path / "out"
+
+    convert_to_webp(src, out, 80, num_threads=2, logger=logging.getLogger("test"))
+
+    produced = sorted(str(p.relative_to(out)).replace("\\", "/") for p in out.rglob("*") if p.is_file())
+    assert produced == [
+        "ComicInfo.xml",
+        "page000.webp",
+        "page001.webp",
+        "page002.webp",
+        "sub/page000.webp",
+    ]
+
+
+def test_prefetch_extractions_yields_in_order_and_cleans_up(tmp_path):
+    archives = []
+    for name in ("a", "b"):
+        archive = tmp_path / f"{name}.cbz"
+        with zipfile.ZipFile(archive, "w") as z:
+            z.writestr("page.txt", name)
+        archives.append(archive)
+    broken = tmp_path / "broken.cbz"
+    broken.write_bytes(b"not a zip")
+    archives.insert(1, broken)
+
+    seen = []
+    for archive, extract_dir in prefetch_extractions(archives, logging.getLogger("test")):
+        if extract_dir is None:
+            seen.append((archive, None))
+            continue
+        seen.append((archive, (extract_dir / "page.txt").read_text()))
+        last_dir = extract_dir
+
+    assert seen == [(archives[0], "a"), (broken, None), (archives[2], "b")]
+    assert not last_dir.exists()
+
+
+def test_apply_preprocessing_keeps_size_and_mode():
+    img = Image.new("RGB", (40, 30), (120, 60, 30))
+    for preprocessing in ("unsharp_mask", "reduce_noise"):
+        out = apply_preprocessing(img, preprocessing)
+        assert out.size == img.size
+        assert out.mode == img.mode
+    assert apply_preprocessing(img, "none") is img
+
+
+def test_select_webp_method_caps_large_images():
+    assert select_webp_method(2000, 3000, 6) == 4
+    assert select_webp_method(2000, 3000, 2) == 2
+    assert select_webp_method(2000, 3000, 6, webp_method_large=5) == 5
+    assert select_webp_method(800, 1200, 6) == 6
+    assert select_webp_method(800, 1200, 6, webp_method_small=3) == 3
+
+
+def test_convert_single_image_reports_sizes(tmp_path):
+    (src,) = _make_images(tmp_path, 1)
+    webp = tmp_path / "out" / "page000.webp"
+    result = convert_single_image((src, webp, {}))
+    assert result[2], result[3]
+    assert result[5:] == (src.stat().st_size, webp.stat().st_size)
+
+
+def test_convert_single_image_opens_pages_outside_the_format_whitelist(tmp_path):
+    src = tmp_path / "page.png"
+    Image.new("RGB", (40, 30), (90, 120, 200)).save(src, "PPM")  # PPM data behind a .png name
+    webp = tmp_path / "out" / "page.webp"
+    result = convert_single_image((src, webp, {}))
+    assert result[2], result[3]
+    with Image.open(webp) as out:
+        assert out.size == (40, 30)
+
+
+def test_memory_capped_workers_limits_huge_images(tmp_path, monkeypatch):
+    (sample,) = _make_images(tmp_path, 1, size=(1000, 1000))
+    monkeypatch.setattr(conversion, "_available_memory", lambda: 12_000_000)
+    # 3 MB decoded, budgeted twice per worker
+    assert memory_capped_workers(8, sample) == 2
+    monkeypatch.setattr(conversion, "_available_memory", lambda: None)
+    assert memory_capped_workers(8, sample) == 8
+
+
+def test_imap_unordered_returns_every_result():
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        results = list(imap_unordered(executor, abs, range(-10, 0), chunksize=3))
+    assert sorted(results) == list(range(1, 11))
+
+
+def test_imap_unordered_bounds_chunks_in_flight():
+    from concurrent.futures import ThreadPoolExecutor
+
+    class CountingExecutor(ThreadPoolExecutor):
+        submitted = 0
+
+        def submit(self, *args, **kwargs):
+            self.submitted += 1
+            return super().submit(*args, **kwargs)
+
+    with CountingExecutor(max_workers=2) as executor:
+        results = imap_unordered(executor, abs, range(-20, 0), chunksize=1, max_in_flight=4)
+        first = next(results)
+        assert executor.submitted == 4
+        assert sorted([first, *results]) == list(range(1, 21))
+    assert executor.submitted == 20
+
+
+def _batch_args(**overrides):
+    args = dict(
+        quality=80, max_width=0, max_height=0, method=4, preprocessing=None, lossless=False,
+        grayscale=False, auto_contrast=False, threads=2, no_cbz=False,
+        keep_originals=False, output='cbz', zip_compression=6, verbose=False,
+    )
+    args.update(overrides)
+    return SimpleNamespace(**args)
+
+
+def _make_cbz(path, page_names):
+    with zipfile.ZipFile(path, "w") as zf:
+        for name in page_names:
+            image = path.parent / name
+            Image.new("RGB", (64, 48), (200, 40, 40)).save(image)
+            zf.write(image, name)
+            image.unlink()
+
+
+def test_process_archive_files_runs_same_stem_archives_one_after_another(tmp_path):
+    src = tmp_path / "in"
+    src.mkdir()
+    first = src / "Vol1.cbz"
+    second = src / "Vol1.zip"  # Same stem: same working folder and output archive
+    other = src / "Vol2.cbz"
+    _make_cbz(first, [f"a{i}.png" for i in range(6)])
+    _make_cbz(second, [f"b{i}.png" for i in range(6)])
+    _make_cbz(other, [f"c{i}.png" for i in range(6)])
+    out = tmp_path / "out"
+
+    success_count, _, _, processed = process_archive_files(
+        [first, second, other], out, _batch_args(), logging.getLogger("test")
+    )
+
+    assert success_count == 3
+    assert [entry[0] for entry in processed] == ["Vol1.cbz", "Vol1.zip", "Vol2.cbz"]
+    # The later archive replaced the earlier one whole, never a mix of both
+    with zipfile.ZipFile(out / "Vol1.cbz") as zf:
+        assert sorted(zf.namelist()) == [f"b{i}.webp" for i in range(6)]
+    assert not (out / "Vol1").exists()
+
+
+def test_process_archive_files_runs_memory_capped_archives_alone(tmp_path, monkeypatch):
+    archives = []
+    for name in ("one", "two", "three"):
+        archive = tmp_path / f"{name}.cbz"
+        _make_cbz(archive, [f"{name}_{i}.png" for i in range(4)])
+        archives.append(archive)
+    active = []
+    overlaps = []
+    lock = threading.Lock()
+    real_convert = conversion.convert_single_image
+
+    def tracking_convert(args):
+        owner = Path(args[0]).name.split("_")[0]
+        with lock:
+            active.append(owner)
+            overlaps.append(set(active))
+        time.sleep(0.02)
+        try:
+            return real_convert(args)
+        finally:
+            with lock:
+                active.remove(owner)
+
+    monkeypatch.setattr(conversion, "convert_single_image", tracking_convert)
+    monkeypatch.setattr(conversion, "_should_convert_inline", lambda conversion_args, num_threads: False)
+    monkeypatch.setattr(conversion, "memory_capped_workers",
+                        lambda num_threads, sample: 1 if Path(sample).name.startswith("two_") else num_threads)
+
+    success_count, _, _, _ = process_archive_files(
+        archives, tmp_path / "out", _batch_args(no_cbz=True, threads=4, thread_pool=True),
+        logging.getLogger("test"))
+
+    assert success_count == 3
+    assert {"two"} in overlaps
+    assert not any("two" in running and len(running) > 1 for running in overlaps)
@@ -0,0 +1,200 @@
+import logging
+import threading
+import time
+import zipfile
+from types import SimpleNamespace
+
+from PIL import Image
+
+from cbxtools.core.file_processor import FileProcessor, find_processable_items
+
+
+def _touch(path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"")
+
+
+def test_find_processable_items_classifies_archives_images_and_folders(tmp_path):
+    for rel in (
+        "cover.png", "notes.txt", "book.cbz",
+        "series/vol1.CBR",
+        "scans/ch1/p1.JPG", "scans/ch1/p2.jpg",
+        "mixed/p1.png", "mixed/extra.cbz",
+        "empty/readme.txt",
+    ):
+        _touch(tmp_path / rel)
+
+    assert find_processable_items(tmp_path) == [tmp_path / "book.cbz", tmp_path / "cover.png"]
+    assert find_processable_items(tmp_path, recursive=True) == sorted([
+        tmp_path / "book.cbz",
+        tmp_path / "cover.png",
+        tmp_path / "mixed" / "extra.cbz",
+        tmp_path / "scans" / "ch1",
+        tmp_path / "series" / "vol1.CBR",
+    ])
+
+
+def _args(**overrides):
+    args = dict(
+        quality=80, max_width=0, max_height=0, method=4, preprocessing=None, lossless=False,
+        grayscale=False, auto_contrast=False, auto_greyscale=False,
+        auto_greyscale_pixel_threshold=16, auto_greyscale_percent_threshold=0.01,
+        preserve_auto_greyscale_png=False, verbose=False, threads=2, no_cbz=False,
+        keep_originals=False, output='cbz', zip_compression=6,
+    )
+    args.update(overrides)
+    return SimpleNamespace(**args)
+
+
+def test_process_item_converts_image_folders_and_single_images(tmp_path):
+    folder = tmp_path / "in" / "scans"
+    folder.mkdir(parents=True)
+    for i in range(3):
+        Image.new("RGB", (64, 48), (i * 40, 80, 160)).save(folder / f"p{i}.png")
+    single = tmp_path / "in" / "cover.png"
+    Image.new("RGB", (64, 48), (200, 10, 10)).save(single)
+    out = tmp_path / "out"
+
+    processor = FileProcessor(logging.getLogger("test"))
+    try:
+        folder_result = processor.process_item(folder, out, _args())
+        single_result = processor.process_item(single, out, _args())
+    finally:
+        processor.close()
+
+    assert folder_result[0] and single_result[0]
+    with zipfile.ZipFile(out / "scans.cbz") as zf:
+        assert sorted(zf.namelist()) == ["p0.webp", "p1.webp", "p2.webp"]
+    assert not (out / "scans").exists()
+    assert single_result[1] == single.stat().st_size
+    assert single_result[2] == (out / "cover.webp").stat().st_size
+
+
+def test_process_item_skips_missing_items(tmp_path):
+    processor = FileProcessor(logging.getLogger("test"))
+    assert processor.process_item(tmp_path / "gone.cbz", tmp_path / "out", _args()) == (False, 0, 0)
+    assert not (tmp_path / "out").exists()
+
+
+def test_process_items_batch_returns_results_in_item_order(tmp_path):
+    images = []
+    for i in range(4):
+        image = tmp_path / "in" / f"page{i}.png"
+        image.parent.mkdir(exist_ok=True)
+        Image.new("RGB", (32 + i, 32), (i * 50, 0, 0)).save(image)
+        images.append(image)
+    items = images + [tmp_path / "in" / "missing.png"]
+    out = tmp_path / "out"
+
+    processor = FileProcessor(logging.getLogger("test"))
+    try:
+        results = processor.process_items_batch(items, out, _args(), max_workers=3)
+    finally:
+        processor.close()
+
+    assert [r[0] for r in results] == [True, True, True, True, False]
+    for image, (_, orig, new) in zip(images, results):
+        assert orig == image.stat().st_size
+        assert new == (out / f"{image.stem}.webp").stat().st_size
+
+
+def test_process_items_batch_runs_items_with_one_output_stem_one_at_a_time(tmp_path, monkeypatch):
+    inp = tmp_path / "in"
+    (inp / "sub").mkdir(parents=True)
+    items = [inp / "x.jpg", inp / "x.png", inp / "y.png", inp / "sub" / "x.png"]
+    for item in items:
+        Image.new("RGB", (32, 32), (10, 200, 10)).save(item)
+    running = []
+    overlaps = []
+    lock = threading.Lock()
+
+    def fake_process_item(item, output_dir, args, preserve_directory_structure, input_base_dir):
+        with lock:
+            running.append(item)
+            overlaps.append(set(running))
+        time.sleep(0.05)
+        with lock:
+            running.remove(item)
+        return True, 1, 1
+
+    processor = FileProcessor(logging.getLogger("test"))
+    monkeypatch.setattr(processor, "process_item", fake_process_item)
+    results = processor.process_items_batch(items, tmp_path / "out", _args(), preserve_directory_structure=True,
+                                            input_base_dir=inp, max_workers=4)
+
+    assert results == [(True, 1, 1)] * 4
+    assert not any({inp / "x.jpg", inp / "x.png"} <= running_now for running_now in overlaps)
+    # Same stem in another output directory does not collide, so it may overlap
+    assert any(inp / "sub" / "x.png" in running_now and len(running_now) > 1 for running_now in overlaps)
+
+
+def test_process_items_batch_groups_folders_by_their_full_name(tmp_path, monkeypatch):
+    inp = tmp_path / "in"
+    for name in ("vol.1", "vol.2", "x"):
+        (inp / name).mkdir(parents=True)
+    (inp / "x.cbz").write_bytes(b"")
+    items = [inp / "vol.1", inp / "vol.2", inp / "x", inp / "x.cbz"]
+    running = []
+    overlaps = []
+    lock = threading.Lock()
+
+    def fake_process_item(item, output_dir, args, preserve_directory_structure, input_base_dir):
+        with lock:
+            running.append(item.name)
+            overlaps.append(set(running))
+        time.sleep(0.05)
+        with lock:
+            running.remove(item.name)
+        return True, 1, 1
+
+    processor = FileProcessor(logging.getLogger("test"))
+    monkeypatch.setattr(processor, "process_item", fake_process_item)
+    processor.process_items_batch(items, tmp_path / "out", _args(), max_workers=4)
+
+    assert not any({"x", "x.cbz"} <= running_now for running_now in overlaps)
+    assert any({"vol.1", "vol.2"} <= running_now for running_now in overlaps)
+
+
+def test_process_items_batch_converts_memory_capped_folders_alone(tmp_path, monkeypatch):
+    from cbxtools import conversion
+
+    inp = tmp_path / "in"
+    folders = []
+    for name in ("big", "small", "other"):
+        folder = inp / name
+        folder.mkdir(parents=True)
+        for i in range(4):
+            Image.new("RGB", (32, 32), (i * 40, 90, 90)).save(folder / f"{name}_{i}.png")
+        folders.append(folder)
+    active = []
+    overlaps = []
+    lock = threading.Lock()
+    real_convert = conversion.convert_single_image
+
+    def tracking_convert(args):
+        owner = args[0].name.split("_")[0]
+        with lock:
+            active.append(owner)
+            overlaps.append(set(active))
+        time.sleep(0.02)
+        try:
+            return real_convert(args)
+        finally:
+            with lock:
+                active.remove(owner)
+
+    monkeypatch.setattr(conversion, "convert_single_image", tracking_convert)
+    monkeypatch.setattr(conversion, "_should_convert_inline", lambda conversion_args, num_threads: False)
+    monkeypatch.setattr(conversion, "memory_capped_workers",
+                        lambda num_threads, sample: 1 if sample.name.startswith("big_") else num_threads)
+
+    processor = FileProcessor(logging.getLogger("test"))
+    try:
+        results = processor.process_items_batch(folders, tmp_path / "out", _args(no_cbz=True, thread_pool=True),
+                                                max_workers=3)
+    finally:
+        processor.close()
+
+    assert all(result[0] for result in results)
+    assert {"big"} in overlaps
+    assert not any("big" in running and len(running) > 1 for running in overlaps)
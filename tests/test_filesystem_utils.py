@@ -0,0 +1,100 @@
+import os
+
+from cbxtools.core.filesystem_utils import FileSystemUtils
+
+
+def test_copy_file_preserves_content_and_mtime(tmp_path):
+    src = tmp_path / "ComicInfo.xml"
+    src.write_bytes(b"<ComicInfo>" + b"x" * 200_000 + b"</ComicInfo>")
+    os.utime(src, (1_000_000_000, 1_000_000_000))
+    dst = tmp_path / "out" / "ComicInfo.xml"
+    dst.parent.mkdir()
+
+    FileSystemUtils.copy_file(src, dst)
+
+    assert dst.read_bytes() == src.read_bytes()
+    assert int(dst.stat().st_mtime) == 1_000_000_000
+
+
+def test_scratch_dir_prefers_env_and_skips_tmpfs_for_huge_archives(tmp_path, monkeypatch):
+    monkeypatch.setenv("CBX_SCRATCH", str(tmp_path))
+    assert FileSystemUtils.scratch_dir(10 * 1024 ** 3) == str(tmp_path)
+
+    monkeypatch.delenv("CBX_SCRATCH")
+    assert FileSystemUtils.scratch_dir(2 * 1024 ** 3) is None
+
+
+def test_scratch_dir_leaves_tmpfs_room_for_expansion_and_concurrency(tmp_path, monkeypatch):
+    from collections import namedtuple
+
+    from cbxtools.core import filesystem_utils
+
+    usage = namedtuple("usage", "total used free")
+    monkeypatch.delenv("CBX_SCRATCH", raising=False)
+    monkeypatch.setattr(filesystem_utils, "TMPFS_SCRATCH_DIR", str(tmp_path))
+    size = 100 * 1024 ** 2
+    needed = size * filesystem_utils.TMPFS_SCRATCH_EXPANSION * filesystem_utils.TMPFS_SCRATCH_CONCURRENCY
+
+    monkeypatch.setattr(filesystem_utils.shutil, "disk_usage", lambda path: usage(0, 0, needed - 1))
+    assert FileSystemUtils.scratch_dir(size) is None
+    monkeypatch.setattr(filesystem_utils.shutil, "disk_usage", lambda path: usage(0, 0, needed))
+    assert FileSystemUtils.scratch_dir(size) == str(tmp_path)
+
+
+def test_get_directory_size_sums_nested_files(tmp_path):
+    (tmp_path / "a" / "b").mkdir(parents=True)
+    (tmp_path / "p1.webp").write_bytes(b"x" * 10)
+    (tmp_path / "a" / "p2.webp").write_bytes(b"x" * 200)
+    (tmp_path / "a" / "b" / "p3.webp").write_bytes(b"x" * 3000)
+
+    assert FileSystemUtils.get_directory_size(tmp_path) == 3210
+    assert FileSystemUtils.get_directory_size(tmp_path / "a" / "b") == 3000
+
+
+def test_cleanup_empty_directories_removes_empty_branches_bottom_up(tmp_path):
+    (tmp_path / "a" / "b" / "c").mkdir(parents=True)
+    (tmp_path / "keep" / "empty").mkdir(parents=True)
+    (tmp_path / "keep" / "page.webp").write_bytes(b"x")
+
+    FileSystemUtils.cleanup_empty_directories(tmp_path)
+
+    assert sorted(p.relative_to(tmp_path).as_posix() for p in tmp_path.rglob("*")) == [
+        "keep", "keep/page.webp",
+    ]
+
+
+def test_fast_rmtree_removes_nested_tree_without_following_symlinks(tmp_path):
+    outside = tmp_path / "outside"
+    outside.mkdir()
+    (outside / "keep.txt").write_bytes(b"x")
+    tree = tmp_path / "tree"
+    (tree / "a" / "b").mkdir(parents=True)
+    (tree / "empty").mkdir()
+    for i in range(20):
+        (tree / "a" / f"{i}.webp").write_bytes(b"p")
+    (tree / "a" / "b" / "last.webp").write_bytes(b"p")
+    os.symlink(outside, tree / "link")
+
+    FileSystemUtils.fast_rmtree(tree)
+
+    assert not tree.exists()
+    assert (outside / "keep.txt").exists()
+
+
+def test_remove_empty_dirs_climbs_to_first_non_empty_parent(tmp_path):
+    root = tmp_path / "root"
+    leaf = root / "keep" / "a" / "b"
+    leaf.mkdir(parents=True)
+    (root / "keep" / "page.webp").write_bytes(b"p")
+
+    FileSystemUtils.remove_empty_dirs(leaf, root)
+    assert not (root / "keep" / "a").exists()
+    assert (root / "keep").is_dir()
+
+    (root / "keep" / "page.webp").unlink()
+    FileSystemUtils.remove_empty_dirs(root / "keep", root)
+    assert not (root / "keep").exists()
+    assert root.is_dir()
+
+    FileSystemUtils.remove_empty_dirs(tmp_path, root)  # outside root: untouched
+    assert root.is_dir()
@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+
+from cbxtools.core.image_analyzer import ImageAnalyzer
+
+
+def _grey_page(height=1024, width=768):
+    return np.full((height, width, 3), 128, dtype=np.uint8)
+
+
+def test_should_convert_to_greyscale_decisions_on_large_pages():
+    pure_grey = _grey_page()
+    assert not ImageAnalyzer.should_convert_to_greyscale(pure_grey)
+
+    near_grey = _grey_page()
+    near_grey[::64, ::64] = (200, 100, 100)  # ~0.02% tinted pixels, seen by the sample
+    assert ImageAnalyzer.should_convert_to_greyscale(near_grey)
+
+    colourful = _grey_page()
+    colourful[:200] = (255, 0, 0)
+    assert not ImageAnalyzer.should_convert_to_greyscale(colourful)
+
+
+def test_should_convert_to_greyscale_scans_fully_when_sample_sees_no_colour():
+    page = _grey_page()
+    page[1::8, 1::8][:10, :10] = (255, 0, 0)  # Only on rows/columns the sample skips
+    assert ImageAnalyzer.should_convert_to_greyscale(page)
+
+
+def test_should_convert_to_greyscale_block_scan_respects_threshold_boundary():
+    # 1% of a 200x100 page is 200 pixels; the sample sees none of them
+    page = _grey_page(200, 100)
+    page[1::2, 1::2][:, :2] = (255, 0, 0)
+    assert ImageAnalyzer.should_convert_to_greyscale(page, 16, 0.01)
+    page[1::2, 1::2][0, 2] = (255, 0, 0)
+    assert not ImageAnalyzer.should_convert_to_greyscale(page, 16, 0.01)
+
+
+def test_convert_to_bw_with_contrast_matches_autocontrast():
+    from PIL import Image, ImageOps
+
+    full_range = Image.linear_gradient('L').convert('RGB')
+    narrow = full_range.point(lambda v: 40 + v // 2)
+    for img in (full_range, narrow):
+        expected = ImageOps.autocontrast(img.convert('L'))
+        result = ImageAnalyzer.convert_to_bw_with_contrast(img)
+        assert result.mode == 'L'
+        assert result.tobytes() == expected.tobytes()
+
+
+def test_colorfulness_statistics_match_a_reference_computation():
+    rng = np.random.default_rng(0)
+    page = rng.integers(0, 256, size=(64, 48, 3), dtype=np.uint8)
+    reference = page.max(axis=2).astype(int) - page.min(axis=2).astype(int)
+
+    max_diff, mean_diff, colored_ratio = ImageAnalyzer.analyze_colorfulness(page, 16)
+    detailed = ImageAnalyzer.analyze_colorfulness_detailed(page, 16)
+
+    assert max_diff == reference.max()
+    assert mean_diff == reference.mean()
+    assert colored_ratio == np.count_nonzero(reference > 16) / reference.size
+    assert (detailed['max_diff'], detailed['mean_diff'], detailed['colored_ratio']) == (
+        max_diff, mean_diff, colored_ratio
+    )
+    assert detailed['median_diff'] == float(np.median(reference))
+
+
+def test_is_image_file_matches_suffixes_case_insensitively():
+    assert ImageAnalyzer.is_image_file("scan.TIF")
+    assert ImageAnalyzer.is_image_file("dir.d/page.Jpeg")
+    assert not ImageAnalyzer.is_image_file("page.jpg.txt")
+    assert not ImageAnalyzer.is_image_file("jpg")
+    assert not ImageAnalyzer.is_image_file(".jpg")
+    assert not ImageAnalyzer.is_image_file("dir/.PNG")
+
+
+def test_should_convert_to_greyscale_without_numpy_raises_runtime_error(monkeypatch):
+    from cbxtools.core import image_analyzer
+
+    monkeypatch.setattr(image_analyzer, "_HAS_NUMPY", False)
+    with pytest.raises(RuntimeError):
+        ImageAnalyzer.should_convert_to_greyscale(_grey_page(8, 8))